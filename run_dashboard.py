@@ -6,6 +6,7 @@ This script provides an easy way to run the monitoring dashboard
 without setting up the full pipeline infrastructure.
 """
 
+import importlib.util
 import subprocess
 import sys
 import os
@@ -17,13 +18,14 @@ def main():
     print("🚀 Starting ETL Pipeline Monitoring Dashboard...")
     print("=" * 50)
     
-    # Check if streamlit is installed
-    try:
-        import streamlit
+    # Check if streamlit and plotly are installed without importing them;
+    # the dashboard subprocess imports them in its own interpreter anyway
+    missing = [name for name in ("streamlit", "plotly") if importlib.util.find_spec(name) is None]
+    if not missing:
         print("✅ Streamlit is installed")
-    except ImportError:
-        print("❌ Streamlit not found. Installing...")
-        subprocess.check_call([sys.executable, "-m", "pip", "install", "streamlit", "plotly"])
+    else:
+        print(f"❌ {', '.join(missing)} not found. Installing...")
+        subprocess.check_call([sys.executable, "-m", "pip", "install", *missing])
         print("✅ Streamlit installed successfully")
     
     # Check if dashboard file exists
@@ -38,17 +40,29 @@ def main():
     print("⏹️  Press Ctrl+C to stop the dashboard")
     print("=" * 50)
     
+    command = [
+        sys.executable, "-m", "streamlit", "run", 
+        str(dashboard_path),
+        "--server.port", "8501",
+        "--server.address", "0.0.0.0"
+    ]
+    
+    if os.name == "nt":
+        # execv on Windows spawns a new process instead of replacing this one
+        try:
+            subprocess.run(command)
+        except KeyboardInterrupt:
+            print("\n🛑 Dashboard stopped by user")
+        except Exception as e:
+            print(f"❌ Error running dashboard: {e}")
+        return
+    
+    # Replace this interpreter with streamlit so only one Python process
+    # stays resident; streamlit handles Ctrl+C itself
+    sys.stdout.flush()
     try:
-        # Run the dashboard
-        subprocess.run([
-            sys.executable, "-m", "streamlit", "run", 
-            str(dashboard_path),
-            "--server.port", "8501",
-            "--server.address", "0.0.0.0"
-        ])
-    except KeyboardInterrupt:
-        print("\n🛑 Dashboard stopped by user")
-    except Exception as e:
+        os.execv(sys.executable, command)
+    except OSError as e:
         print(f"❌ Error running dashboard: {e}")
 
 if __name__ == "__main__":
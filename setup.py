@@ -26,10 +26,15 @@ def print_step(step):
     print(f"\n📋 {step}")
 
 def run_command(command, description):
-    """Run a command and handle errors."""
+    """
+    Run a command and handle errors.
+    
+    The command is an argument list executed directly, without spawning an
+    intermediate shell for every step.
+    """
     print(f"🔄 {description}...")
     try:
-        result = subprocess.run(command, shell=True, check=True, capture_output=True, text=True)
+        result = subprocess.run(command, check=True, capture_output=True, text=True)
         print(f"✅ {description} completed successfully")
         return True
     except subprocess.CalledProcessError as e:
@@ -72,10 +77,11 @@ def main():
     
     # Install dependencies
     print_step("Installing Python dependencies")
-    if not run_command(f"{sys.executable} -m pip install --upgrade pip", "Upgrading pip"):
+    if not run_command([sys.executable, "-m", "pip", "install", "--upgrade", "pip"], "Upgrading pip"):
         sys.exit(1)
     
-    if not run_command(f"{sys.executable} -m pip install -r requirements.txt", "Installing requirements"):
+    if not run_command([sys.executable, "-m", "pip", "install", "-r", "requirements.txt"],
+                       "Installing requirements"):
         print("⚠️  Some dependencies may not be installed. Continuing...")
     
     # Create configuration files
@@ -176,6 +182,26 @@ monitoring:
         f.write(config_content)
     print("✅ Created pipeline configuration file")
     
+    # Create record schemas, keyed by ingestor type; the ETL processor
+    # compiles a validator per schema (see ETL_RECORD_SCHEMAS_PATH)
+    record_schemas_content = """{
+  "csv": {
+    "customer_id": {"type": "string", "required": true},
+    "customer_name": {"type": "string", "required": true},
+    "email": {"type": "string", "required": false},
+    "registration_date": {"type": "datetime", "required": false},
+    "last_purchase_date": {"type": "datetime", "required": false},
+    "total_purchases": {"type": "numeric", "default": 0},
+    "avg_order_value": {"type": "numeric", "required": false},
+    "customer_segment": {"type": "string", "default": "Standard"}
+  }
+}
+"""
+    
+    with open("config/record_schemas.json", "w") as f:
+        f.write(record_schemas_content)
+    print("✅ Created record schema file")
+    
     # Create database initialization script
     db_init_content = """-- Database initialization script for ETL pipeline
 
@@ -7,4 +7,31 @@ Handles data ingestion from multiple sources including:
 - Web scraping
 - IoT devices
 - Real-time streaming
+
+Ingestors are loaded lazily on first attribute access so that importing
+the package only pulls in the dependencies of the sources actually used.
 """
+
+import importlib
+
+_LAZY = {
+    "CSVIngestor": "src.ingestion.csv_ingestor",
+    "APIIngestor": "src.ingestion.api_ingestor",
+    "WebScraperIngestor": "src.ingestion.web_scraper_ingestor",
+    "StreamingIngestor": "src.ingestion.streaming_ingestor",
+    "DataIngestionManager": "src.ingestion.data_ingestion_manager",
+}
+
+__all__ = list(_LAZY)
+
+def __getattr__(name):
+    """Import an ingestor module on first access (PEP 562)."""
+    if name not in _LAZY:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    module = importlib.import_module(_LAZY[name])
+    value = getattr(module, name)
+    globals()[name] = value
+    return value
+
+def __dir__():
+    return sorted(list(globals()) + __all__)
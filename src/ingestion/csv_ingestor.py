@@ -9,26 +9,134 @@ Handles ingestion of data from CSV files with support for:
 """
 
 import asyncio
-import pandas as pd
+import csv
+import functools
+import json
+import os
 import time
+from concurrent.futures import ThreadPoolExecutor
 from pathlib import Path
-from typing import Dict, Any, List, Optional
+from typing import TYPE_CHECKING, Dict, Any, Iterator, List, Optional, Union
 from datetime import datetime
 
-import structlog
-from kafka import KafkaProducer
-
 from src.utils.logger_setup import PipelineLogger
+from src.utils.metrics import AtomicCounter, MetricBuffer
+
+if TYPE_CHECKING:
+    import pandas as pd
+    import pyarrow as pa
+    from kafka import KafkaProducer
+
+@functools.lru_cache(maxsize=32)
+def _schema_plan(schema_key: tuple) -> Dict[str, Any]:
+    """
+    Derive the column groups used by schema validation.
+    
+    Cached on the frozen schema so files sharing a schema skip the rebuild.
+    """
+    columns_by_type = lambda t: [col for col, col_type, _, _ in schema_key if col_type == t]
+    return {
+        "required": frozenset(col for col, _, required, _ in schema_key if required),
+        "datetime": columns_by_type('datetime'),
+        "numeric": columns_by_type('numeric'),
+        "string": columns_by_type('string'),
+        "defaults": {col: default for col, _, _, default in schema_key if default is not None}
+    }
+
+def _freeze_schema(schema: Dict) -> tuple:
+    """
+    Turn a schema dict into a key for `_schema_plan`.
+    
+    Only the fields the plan reads are kept, so extra config keys never
+    affect caching.
+    """
+    return tuple(
+        (col, cfg.get('type'), cfg.get('required', True), cfg.get('default'))
+        for col, cfg in schema.items()
+    )
+
+def _get_schema_plan(schema: Dict) -> Dict[str, Any]:
+    """Get the (cached) validation plan for a schema."""
+    schema_key = _freeze_schema(schema)
+    try:
+        return _schema_plan(schema_key)
+    except TypeError:
+        # Unhashable default (e.g. a list or dict): build it uncached
+        return _schema_plan.__wrapped__(schema_key)
+
+def _arrow_column_types(schema: Dict) -> Dict[str, Any]:
+    """
+    Map schema types to the Arrow types the CSV reader converts to.
+    
+    Fixing the types stops the streaming reader from inferring them from
+    the first block only. Datetime columns are read as strings and parsed
+    by `_validate_schema`, which coerces bad values instead of failing.
+    """
+    import pyarrow as pa
+    
+    arrow_types = {"numeric": pa.float64(), "string": pa.string(), "datetime": pa.string()}
+    return {col: arrow_types[cfg.get('type')] for col, cfg in schema.items()
+            if cfg.get('type') in arrow_types}
+
+def _read_header(file_path: str) -> List[str]:
+    """Read the column names from the first line of a CSV file."""
+    with open(file_path, newline='') as f:
+        return next(csv.reader(f), [])
+
+def _iter_records(batch) -> Iterator[Dict[str, Any]]:
+    """Yield one dict per row of a DataFrame or Arrow RecordBatch."""
+    if hasattr(batch, "itertuples"):
+        columns = list(batch.columns)
+        for row in batch.itertuples(index=False, name=None):
+            yield dict(zip(columns, row))
+    else:
+        yield from batch.to_pylist()
+
+def _column_values(column: "pd.Series"):
+    """
+    Column values to send for a DataFrame column.
+    
+    Datetime columns become the same ISO strings the row path sends via
+    Timestamp.isoformat(), with NaT as None; raw datetime64 arrays would
+    serialize with a UTC offset and fail outright on NaT.
+    """
+    import pandas as pd
+    
+    if pd.api.types.is_datetime64_any_dtype(column.dtype):
+        iso = column.map(lambda value: value.isoformat(), na_action='ignore')
+        return iso.astype(object).where(column.notna(), None).to_numpy()
+    return column.to_numpy()
+
+def _to_columns(batch) -> Dict[str, Any]:
+    """Map column name to column values for a DataFrame or Arrow RecordBatch."""
+    if hasattr(batch, "itertuples"):
+        return {column: _column_values(batch[column]) for column in batch.columns}
+    return batch.to_pydict()
 
 class CSVIngestor:
     """Handles CSV file ingestion with data validation and quality checks."""
     
-    def __init__(self, kafka_producer: KafkaProducer, monitor):
+    def __init__(self, kafka_producer: "KafkaProducer", monitor, max_workers: int = 4,
+                 record_counter: Optional[AtomicCounter] = None,
+                 metrics_flush_interval: float = 30.0):
         """Initialize the CSV ingestor."""
         self.kafka_producer = kafka_producer
         self.monitor = monitor
+        self.record_counter = record_counter
+        self._metric_buf = MetricBuffer(monitor, flush_interval=metrics_flush_interval)
         self.logger = PipelineLogger(__name__)
         
+        # Parsing runs on a persistent thread pool; the semaphore bounds how
+        # many files of a directory are in flight at once
+        self.max_workers = max_workers
+        self._executor = None
+        self._file_semaphore = None
+        
+        # Incremental loading watermark: {file_path: (mtime, size)} of files
+        # already ingested, persisted between runs
+        self._watermark_path = Path("data/.ingest_watermark.json")
+        self._watermark: Dict[str, tuple] = {}
+        
         # Processing state
         self.is_running = False
         self.current_file = None
@@ -45,17 +153,26 @@ class CSVIngestor:
     async def initialize(self):
         """Initialize the CSV ingestor."""
         self.logger.log_pipeline_status("initializing", "csv_ingestor")
+        self._executor = ThreadPoolExecutor(max_workers=self.max_workers,
+                                            thread_name_prefix="csv-ingestor")
+        self._file_semaphore = asyncio.Semaphore(self.max_workers)
+        self._watermark = self._load_watermark()
         self.logger.log_pipeline_status("initialized", "csv_ingestor")
     
     async def start(self):
         """Start the CSV ingestor."""
         self.logger.log_pipeline_status("started", "csv_ingestor")
         self.is_running = True
+        self._metric_buf.start()
     
     async def shutdown(self):
         """Shutdown the CSV ingestor."""
         self.logger.log_pipeline_status("shutdown", "csv_ingestor")
         self.is_running = False
+        await self._metric_buf.stop()
+        if self._executor:
+            self._executor.shutdown(wait=False)
+            self._executor = None
     
     async def ingest_data(self, config: Dict[str, Any]):
         """
@@ -68,6 +185,10 @@ class CSVIngestor:
                 - batch_size: Number of records to process per batch
                 - validate_data: Whether to perform data validation
                 - incremental: Whether to use incremental loading
+                - schema_columns_only: Only parse the columns listed in schema
+                - engine: CSV reader to use, "pandas" (default) or "pyarrow"
+                - send_format: "rows" (default) sends one message per record,
+                  "columnar" sends one message of column arrays per batch
         """
         try:
             file_path = config.get("file_path")
@@ -75,15 +196,20 @@ class CSVIngestor:
             batch_size = config.get("batch_size", 1000)
             validate_data = config.get("validate_data", True)
             incremental = config.get("incremental", False)
+            schema_columns_only = config.get("schema_columns_only", False)
+            engine = config.get("engine", "pandas")
+            send_format = config.get("send_format", "rows")
             
             self.logger.log_ingestion_start("csv", None)
             start_time = time.time()
             
             # Process CSV file(s)
             if Path(file_path).is_dir():
-                await self._process_directory(file_path, schema, batch_size, validate_data, incremental)
+                await self._process_directory(file_path, schema, batch_size, validate_data, incremental,
+                                              schema_columns_only, engine, send_format)
             else:
-                await self._process_single_file(file_path, schema, batch_size, validate_data, incremental)
+                await self._process_single_file(file_path, schema, batch_size, validate_data, incremental,
+                                                schema_columns_only, engine, send_format)
             
             processing_time = time.time() - start_time
             self.stats["processing_time"] = processing_time
@@ -100,30 +226,42 @@ class CSVIngestor:
             raise
     
     async def _process_single_file(self, file_path: str, schema: Dict, batch_size: int, 
-                                  validate_data: bool, incremental: bool):
-        """Process a single CSV file."""
+                                  validate_data: bool, incremental: bool,
+                                  schema_columns_only: bool = False, engine: str = "pandas",
+                                  send_format: str = "rows"):
+        """Process a single CSV file, streaming it in batch-sized chunks."""
         try:
             self.current_file = file_path
             self.logger.logger.info(f"Processing CSV file: {file_path}")
             
-            # Read CSV file
-            df = pd.read_csv(file_path)
-            total_records = len(df)
-            
-            # Validate schema if provided
-            if schema and validate_data:
-                df = self._validate_schema(df, schema)
+            if engine == "pyarrow":
+                batches = self._iter_arrow_batches(file_path, schema, batch_size, schema_columns_only)
+            else:
+                batches = self._iter_pandas_batches(file_path, schema, batch_size, schema_columns_only)
             
-            # Process in batches
-            for i in range(0, len(df), batch_size):
-                batch = df.iloc[i:i + batch_size]
-                await self._process_batch(batch, file_path)
-                
-                # Small delay to prevent overwhelming the system
-                await asyncio.sleep(0.01)
+            # Parsing and validation are blocking, so each batch is produced on
+            # the thread pool while sending stays on the event loop
+            loop = asyncio.get_running_loop()
+            validate = bool(schema and validate_data)
+            key = file_path.encode('utf-8')
+            total_records = 0
+            try:
+                while True:
+                    batch = await loop.run_in_executor(
+                        self._executor, self._next_batch, batches, schema, validate, engine
+                    )
+                    if batch is None:
+                        break
+                    
+                    # Flow control comes from the producer's bounded buffer
+                    # (see _process_batch), not from sleeping between batches
+                    await self._process_batch(batch, file_path, key, send_format)
+                    total_records += len(batch)
+                    self.stats["records_ingested"] += len(batch)
+            finally:
+                batches.close()
             
             self.stats["files_processed"] += 1
-            self.stats["records_ingested"] += total_records
             
             self.logger.logger.info(f"Successfully processed {total_records} records from {file_path}")
             
@@ -131,47 +269,159 @@ class CSVIngestor:
             self.logger.log_error(e, {"file_path": file_path})
             raise
     
+    def _next_batch(self, batches: Iterator, schema: Dict, validate: bool, engine: str):
+        """Read and validate the next batch; returns None once the file is exhausted."""
+        batch = next(batches, None)
+        if batch is None or not validate:
+            return batch
+        if engine == "pyarrow":
+            batch = batch.to_pandas()
+        return self._validate_schema(batch, schema)
+    
+    def _iter_pandas_batches(self, file_path: str, schema: Dict, batch_size: int,
+                             schema_columns_only: bool):
+        """Yield DataFrame chunks of a CSV file using the pandas C parser."""
+        # Deferred so importing the ingestion package doesn't pull in pandas
+        import pandas as pd
+        
+        # Skip non-schema columns at the parser level when requested; a
+        # callable tolerates optional schema columns absent from the file
+        usecols = (lambda column: column in schema) if schema and schema_columns_only else None
+        
+        # Read the CSV lazily so the first batch ships while the rest of
+        # the file is still being parsed and memory stays bounded
+        with pd.read_csv(file_path, chunksize=batch_size, usecols=usecols, engine='c') as reader:
+            yield from reader
+    
+    def _iter_arrow_batches(self, file_path: str, schema: Dict, batch_size: int,
+                            schema_columns_only: bool):
+        """
+        Yield Arrow RecordBatches of a CSV file using the PyArrow reader.
+        
+        The reader parses blocks on multiple threads and keeps data columnar,
+        so records are only materialized as Python objects at send time.
+        Blocks are cut into `batch_size`-row batches with zero-copy slices.
+        """
+        from pyarrow import csv as pa_csv
+        
+        include_columns = None
+        if schema and schema_columns_only:
+            # Only optional columns may be absent and null-filled; a missing
+            # required column is left out so _validate_schema reports it,
+            # as it does for the pandas engine
+            header = set(_read_header(file_path))
+            include_columns = [col for col, cfg in schema.items()
+                               if col in header or not cfg.get('required', True)]
+        
+        read_options = pa_csv.ReadOptions(block_size=8 << 20, use_threads=True)
+        convert_options = pa_csv.ConvertOptions(
+            column_types=_arrow_column_types(schema) if schema else None,
+            include_columns=include_columns,
+            include_missing_columns=include_columns is not None
+        )
+        reader = pa_csv.open_csv(file_path, read_options=read_options,
+                                 convert_options=convert_options)
+        try:
+            for block in reader:
+                for offset in range(0, block.num_rows, batch_size):
+                    yield block.slice(offset, batch_size)
+        finally:
+            reader.close()
+    
     async def _process_directory(self, directory_path: str, schema: Dict, batch_size: int,
-                               validate_data: bool, incremental: bool):
-        """Process all CSV files in a directory."""
+                               validate_data: bool, incremental: bool,
+                               schema_columns_only: bool = False, engine: str = "pandas",
+                               send_format: str = "rows"):
+        """Process all CSV files in a directory, several files at a time."""
         directory = Path(directory_path)
-        csv_files = list(directory.glob("*.csv"))
+        candidates = ((path, path.stat()) for path in directory.glob("*.csv"))
         
-        self.logger.logger.info(f"Found {len(csv_files)} CSV files in {directory_path}")
+        # With incremental loading, skip files unchanged since they were last ingested
+        if incremental:
+            candidates = (
+                (path, stat) for path, stat in candidates
+                if self._watermark.get(str(path)) != (stat.st_mtime, stat.st_size)
+            )
+        csv_files = list(candidates)
         
-        for csv_file in csv_files:
-            try:
-                await self._process_single_file(
-                    str(csv_file), schema, batch_size, validate_data, incremental
-                )
-            except Exception as e:
-                self.logger.log_error(e, {"file_path": str(csv_file)})
-                continue  # Continue with next file even if one fails
-    
-    async def _process_batch(self, batch_df: pd.DataFrame, source_file: str):
-        """Process a batch of records and send to Kafka."""
+        self.logger.logger.info(f"Found {len(csv_files)} CSV files to process in {directory_path}")
+        
+        semaphore = self._file_semaphore or asyncio.Semaphore(self.max_workers)
+        
+        async def process_file(csv_file: Path, stat: os.stat_result):
+            async with semaphore:
+                try:
+                    await self._process_single_file(
+                        str(csv_file), schema, batch_size, validate_data, incremental,
+                        schema_columns_only, engine, send_format
+                    )
+                except Exception as e:
+                    # Continue with the other files even if one fails
+                    self.logger.log_error(e, {"file_path": str(csv_file)})
+                    return
+                
+                self._watermark[str(csv_file)] = (stat.st_mtime, stat.st_size)
+                self._save_watermark()
+        
+        await asyncio.gather(*(process_file(csv_file, stat) for csv_file, stat in csv_files))
+    
+    def _load_watermark(self) -> Dict[str, tuple]:
+        """Load the incremental loading watermark from disk."""
+        try:
+            with open(self._watermark_path) as f:
+                return {path: tuple(entry) for path, entry in json.load(f).items()}
+        except FileNotFoundError:
+            return {}
+        except (OSError, ValueError) as e:
+            self.logger.log_error(e, {"watermark_path": str(self._watermark_path)})
+            return {}
+    
+    def _save_watermark(self):
+        """Atomically rewrite the incremental loading watermark."""
+        self._watermark_path.parent.mkdir(parents=True, exist_ok=True)
+        tmp_path = self._watermark_path.with_suffix(".tmp")
+        with open(tmp_path, "w") as f:
+            json.dump(self._watermark, f)
+        os.replace(tmp_path, self._watermark_path)
+    
+    async def _process_batch(self, batch_df: Union["pd.DataFrame", "pa.RecordBatch"], source_file: str,
+                             key: Optional[bytes] = None, send_format: str = "rows"):
+        """
+        Process a batch of records (DataFrame or Arrow RecordBatch) and send to Kafka.
+        
+        Args:
+            batch_df: Batch of rows to send
+            source_file: File the batch was read from
+            key: Pre-encoded Kafka key, reused across all batches of a file
+            send_format: "rows" for one message per record, "columnar" for a
+                single `{"_columns": {...}, "_metadata": {...}}` message
+        """
         try:
-            # Convert batch to records
-            records = batch_df.to_dict('records')
-            
-            # Add metadata to each record
-            for record in records:
-                record['_metadata'] = {
-                    'source_file': source_file,
-                    'ingestion_timestamp': datetime.utcnow().isoformat(),
-                    'ingestor_type': 'csv'
-                }
-            
-            # Send to Kafka
-            for record in records:
-                self.kafka_producer.send(
-                    topic='raw-data',
-                    key=source_file.encode('utf-8'),
-                    value=record
-                )
+            # Metadata and key are identical for every record in the batch
+            metadata = {
+                'source_file': source_file,
+                'ingestion_timestamp': datetime.utcnow(),
+                'ingestor_type': 'csv'
+            }
+            if key is None:
+                key = source_file.encode('utf-8')
+            
+            if send_format == "columnar":
+                # Ship the column arrays as-is; the consumer rebuilds rows
+                messages = [{'_columns': _to_columns(batch_df)}]
+            else:
+                # Build each record straight from the row data
+                messages = _iter_records(batch_df)
+            
+            # send() blocks for up to max_block_ms while the producer buffer
+            # is full, so the whole batch is sent off the event loop and the
+            # other files in flight keep going
+            await asyncio.to_thread(self._send_messages, messages, metadata, key)
             
             # Record metrics
-            self.monitor.record_metric("csv_records_processed", len(records))
+            if self.record_counter is not None:
+                self.record_counter.add(len(batch_df))
+            self._metric_buf.add("csv_records_processed", len(batch_df))
             
         except Exception as e:
             self.logger.log_error(e, {
@@ -181,7 +431,23 @@ class CSVIngestor:
             })
             raise
     
-    def _validate_schema(self, df: pd.DataFrame, schema: Dict) -> pd.DataFrame:
+    def _send_messages(self, messages, metadata: Dict[str, Any], key: bytes):
+        """Send a batch's messages to raw-data; runs on a worker thread."""
+        from kafka.errors import KafkaTimeoutError
+        
+        # The producer batches sends internally (see linger_ms/batch_size)
+        send = self.kafka_producer.send
+        for message in messages:
+            message['_metadata'] = metadata
+            try:
+                send('raw-data', key=key, value=message)
+            except KafkaTimeoutError:
+                # Producer buffer stayed full for max_block_ms; drain it,
+                # then retry once
+                self.kafka_producer.flush(1.0)
+                send('raw-data', key=key, value=message)
+    
+    def _validate_schema(self, df: "pd.DataFrame", schema: Dict) -> "pd.DataFrame":
         """
         Validate DataFrame against expected schema.
         
@@ -192,34 +458,34 @@ class CSVIngestor:
         Returns:
             Validated DataFrame
         """
+        import pandas as pd
+        
         try:
-            # Check required columns
-            required_columns = [col for col, config in schema.items() 
-                              if config.get('required', True)]
+            plan = _get_schema_plan(schema)
+            present = set(df.columns)
             
-            missing_columns = set(required_columns) - set(df.columns)
+            # Check required columns
+            missing_columns = plan["required"] - present
             if missing_columns:
                 raise ValueError(f"Missing required columns: {missing_columns}")
             
-            # Validate data types
-            for column, config in schema.items():
-                if column in df.columns:
-                    expected_type = config.get('type')
-                    if expected_type:
-                        # Convert column to expected type
-                        if expected_type == 'datetime':
-                            df[column] = pd.to_datetime(df[column], errors='coerce')
-                        elif expected_type == 'numeric':
-                            df[column] = pd.to_numeric(df[column], errors='coerce')
-                        elif expected_type == 'string':
-                            df[column] = df[column].astype(str)
+            # Convert each group of columns to its expected type in one pass
+            datetime_cols = [col for col in plan["datetime"] if col in present]
+            if datetime_cols:
+                df[datetime_cols] = df[datetime_cols].apply(pd.to_datetime, errors='coerce')
+            
+            numeric_cols = [col for col in plan["numeric"] if col in present]
+            if numeric_cols:
+                df[numeric_cols] = df[numeric_cols].apply(pd.to_numeric, errors='coerce')
+            
+            string_cols = [col for col in plan["string"] if col in present]
+            if string_cols:
+                df = df.astype({col: str for col in string_cols})
             
             # Handle missing values
-            for column, config in schema.items():
-                if column in df.columns:
-                    default_value = config.get('default')
-                    if default_value is not None:
-                        df[column] = df[column].fillna(default_value)
+            defaults = {col: value for col, value in plan["defaults"].items() if col in present}
+            if defaults:
+                df = df.fillna(defaults)
             
             return df
             
@@ -6,27 +6,45 @@ the flow of data into the ETL pipeline.
 """
 
 import asyncio
+import atexit
 import time
 from typing import Dict, Any, List, Optional
 from abc import ABC, abstractmethod
 
 import structlog
 from kafka import KafkaProducer, KafkaConsumer
-import json
 
-from src.utils.config_manager import ConfigManager
+from src.utils.config_manager import KafkaConfig, get_config
 from src.utils.logger_setup import PipelineLogger
-from src.ingestion.csv_ingestor import CSVIngestor
-from src.ingestion.api_ingestor import APIIngestor
-from src.ingestion.web_scraper_ingestor import WebScraperIngestor
-from src.ingestion.streaming_ingestor import StreamingIngestor
+from src.utils.metrics import AtomicCounter
+from src.utils.serialization import serialize_key, serialize_value
+
+# Shared producer so re-initializing the manager skips the broker bootstrap
+_PRODUCER: Optional[KafkaProducer] = None
+
+def get_producer(kafka_config: KafkaConfig) -> KafkaProducer:
+    """Get the process-wide ingestion Kafka producer, creating it on first use."""
+    global _PRODUCER
+    if _PRODUCER is None:
+        _PRODUCER = KafkaProducer(
+            bootstrap_servers=kafka_config.bootstrap_servers,
+            value_serializer=serialize_value,
+            key_serializer=serialize_key,
+            linger_ms=kafka_config.producer_linger_ms,
+            batch_size=kafka_config.producer_batch_size,
+            compression_type=kafka_config.producer_compression_type,
+            buffer_memory=kafka_config.producer_buffer_memory,
+            max_block_ms=kafka_config.producer_max_block_ms
+        )
+        atexit.register(_PRODUCER.close)
+    return _PRODUCER
 
 class DataIngestionManager:
     """Main manager for data ingestion operations."""
     
     def __init__(self, etl_processor, monitor):
         """Initialize the data ingestion manager."""
-        self.config = ConfigManager()
+        self.config = get_config()
         self.logger = PipelineLogger(__name__)
         self.etl_processor = etl_processor
         self.monitor = monitor
@@ -39,6 +57,11 @@ class DataIngestionManager:
         self.ingestors = {}
         self.is_running = False
         
+        # Incremented by ingestors at the point of ingest so the monitor loop
+        # can read the total directly
+        self.record_counter = AtomicCounter()
+        self._counted_ingestors = set()
+        
         # Statistics
         self.stats = {
             "total_records_ingested": 0,
@@ -52,13 +75,8 @@ class DataIngestionManager:
         try:
             self.logger.log_pipeline_status("initializing", "data_ingestion_manager")
             
-            # Initialize Kafka producer
-            kafka_config = self.config.get_kafka_config()
-            self.kafka_producer = KafkaProducer(
-                bootstrap_servers=kafka_config.bootstrap_servers,
-                value_serializer=lambda v: json.dumps(v).encode('utf-8'),
-                key_serializer=lambda k: k.encode('utf-8') if k else None
-            )
+            # Get the shared Kafka producer
+            self.kafka_producer = get_producer(self.config.get_kafka_config())
             
             # Initialize ingestion components
             await self._initialize_ingestors()
@@ -70,30 +88,45 @@ class DataIngestionManager:
             raise
     
     async def _initialize_ingestors(self):
-        """Initialize all data ingestion components."""
+        """Initialize the enabled data ingestion components."""
+        # Each ingestor is imported only when its source is enabled, so
+        # disabled sources never load their dependencies
+        
         # CSV Ingestor
-        self.ingestors['csv'] = CSVIngestor(
-            kafka_producer=self.kafka_producer,
-            monitor=self.monitor
-        )
+        if self.config.get_source_enabled('csv'):
+            from src.ingestion.csv_ingestor import CSVIngestor
+            self.ingestors['csv'] = CSVIngestor(
+                kafka_producer=self.kafka_producer,
+                monitor=self.monitor,
+                max_workers=self.config.get_processing_config().max_workers,
+                record_counter=self.record_counter,
+                metrics_flush_interval=self.config.get_monitoring_config().metrics_flush_interval
+            )
+            self._counted_ingestors.add('csv')
         
         # API Ingestor
-        self.ingestors['api'] = APIIngestor(
-            kafka_producer=self.kafka_producer,
-            monitor=self.monitor
-        )
+        if self.config.get_source_enabled('api'):
+            from src.ingestion.api_ingestor import APIIngestor
+            self.ingestors['api'] = APIIngestor(
+                kafka_producer=self.kafka_producer,
+                monitor=self.monitor
+            )
         
         # Web Scraper Ingestor
-        self.ingestors['web_scraper'] = WebScraperIngestor(
-            kafka_producer=self.kafka_producer,
-            monitor=self.monitor
-        )
+        if self.config.get_source_enabled('web_scraper'):
+            from src.ingestion.web_scraper_ingestor import WebScraperIngestor
+            self.ingestors['web_scraper'] = WebScraperIngestor(
+                kafka_producer=self.kafka_producer,
+                monitor=self.monitor
+            )
         
         # Streaming Ingestor
-        self.ingestors['streaming'] = StreamingIngestor(
-            kafka_producer=self.kafka_producer,
-            monitor=self.monitor
-        )
+        if self.config.get_source_enabled('streaming'):
+            from src.ingestion.streaming_ingestor import StreamingIngestor
+            self.ingestors['streaming'] = StreamingIngestor(
+                kafka_producer=self.kafka_producer,
+                monitor=self.monitor
+            )
         
         # Initialize all ingestors
         for name, ingestor in self.ingestors.items():
@@ -130,9 +163,9 @@ class DataIngestionManager:
             for name, ingestor in self.ingestors.items():
                 await ingestor.shutdown()
             
-            # Close Kafka producer
+            # Flush pending sends; the shared producer is closed at exit
             if self.kafka_producer:
-                self.kafka_producer.close()
+                await asyncio.to_thread(self.kafka_producer.flush)
             
             self.logger.log_pipeline_status("shutdown", "data_ingestion_manager")
             
@@ -143,11 +176,14 @@ class DataIngestionManager:
         """Monitor ingestion performance and health."""
         while self.is_running:
             try:
-                # Update statistics
-                total_records = sum(
+                # Update statistics; only ingestors that don't share the
+                # counter still need their stats walked
+                total_records = self.record_counter.value + sum(
                     ingestor.get_stats().get("records_ingested", 0)
-                    for ingestor in self.ingestors.values()
+                    for name, ingestor in self.ingestors.items()
+                    if name not in self._counted_ingestors
                 )
+                previous_total = self.stats["total_records_ingested"]
                 
                 self.stats["total_records_ingested"] = total_records
                 self.stats["last_ingestion_time"] = time.time()
@@ -156,7 +192,9 @@ class DataIngestionManager:
                 self.monitor.record_metric("ingestion_total_records", total_records)
                 self.monitor.record_metric("ingestion_active_sources", len(self.stats["active_sources"]))
                 
-                await asyncio.sleep(30)  # Update every 30 seconds
+                # Ingestors push their own metrics, so this only needs to
+                # refresh totals every minute, backing off further while idle
+                await asyncio.sleep(60 if total_records != previous_total else 120)
                 
             except Exception as e:
                 self.logger.log_error(e, {"component": "ingestion_monitoring"})
@@ -11,32 +11,39 @@ Orchestrates the entire data pipeline system including:
 """
 
 import asyncio
-import logging
 import signal
 import sys
-from pathlib import Path
 from typing import Dict, Any
 
 import structlog
-from dotenv import load_dotenv
 
-from src.ingestion.data_ingestion_manager import DataIngestionManager
-from src.processing.etl_processor import ETLProcessor
-from src.storage.data_warehouse_manager import DataWarehouseManager
-from src.monitoring.pipeline_monitor import PipelineMonitor
-from src.utils.config_manager import ConfigManager
-from src.utils.logger_setup import setup_logging
+from src.utils.config_manager import get_config, load_env
+from src.utils.logger_setup import setup_logging, stop_logging
 
-# Load environment variables
-load_dotenv()
+log = structlog.get_logger(__name__)
+
+# Upper bound on each component's shutdown so a hung Kafka flush or
+# database close cannot stall process exit
+COMPONENT_SHUTDOWN_TIMEOUT = 5.0
+
+async def _safe_shutdown(name: str, component, timeout: float = COMPONENT_SHUTDOWN_TIMEOUT):
+    """Shut down a component, logging instead of raising on timeout or error."""
+    if component is None:
+        return
+    
+    try:
+        await asyncio.wait_for(component.shutdown(), timeout)
+    except asyncio.TimeoutError:
+        log.warning(f"{name} shutdown timed out after {timeout}s")
+    except Exception as e:
+        log.error(f"Error shutting down {name}: {e}")
 
 class ETLPipelineOrchestrator:
     """Main orchestrator for the ETL pipeline system."""
     
     def __init__(self):
         """Initialize the ETL pipeline orchestrator."""
-        self.config = ConfigManager()
-        self.logger = structlog.get_logger(__name__)
+        self.config = get_config()
         
         # Initialize components
         self.ingestion_manager = None
@@ -44,87 +51,109 @@ class ETLPipelineOrchestrator:
         self.warehouse_manager = None
         self.monitor = None
         
-        # Pipeline state
+        # Pipeline state; is_running is a status flag, _stop wakes start()
         self.is_running = False
+        self._stop = asyncio.Event()
         self.components = {}
         
     async def initialize(self):
         """Initialize all pipeline components."""
         try:
-            self.logger.info("Initializing ETL Pipeline System")
+            log.info("Initializing ETL Pipeline System")
             
-            # Initialize monitoring first
-            self.monitor = PipelineMonitor()
-            await self.monitor.start()
+            # Component subtrees (Kafka, pandas, database drivers) are
+            # imported here so importing this module stays cheap
+            from src.ingestion.data_ingestion_manager import DataIngestionManager
+            from src.monitoring.pipeline_monitor import PipelineMonitor
+            from src.processing.etl_processor import ETLProcessor
+            from src.storage.data_warehouse_manager import DataWarehouseManager
             
-            # Initialize data warehouse
+            # Monitoring and the data warehouse are independent, so bring
+            # them up concurrently
+            self.monitor = PipelineMonitor()
             self.warehouse_manager = DataWarehouseManager()
-            await self.warehouse_manager.initialize()
+            await asyncio.gather(
+                self.monitor.start(),
+                self.warehouse_manager.initialize()
+            )
+            if self._stop.is_set():
+                log.info("Shutdown requested during initialization")
+                return
             
-            # Initialize ETL processor
+            # Processing and ingestion only need the components above
             self.etl_processor = ETLProcessor(
                 warehouse_manager=self.warehouse_manager,
-                monitor=self.monitor
+                monitor=self.monitor,
+                schemas=self.config.get_record_schemas()
             )
-            await self.etl_processor.initialize()
-            
-            # Initialize data ingestion
             self.ingestion_manager = DataIngestionManager(
                 etl_processor=self.etl_processor,
                 monitor=self.monitor
             )
-            await self.ingestion_manager.initialize()
+            await asyncio.gather(
+                self.etl_processor.initialize(),
+                self.ingestion_manager.initialize()
+            )
             
-            self.logger.info("ETL Pipeline System initialized successfully")
+            log.info("ETL Pipeline System initialized successfully")
             
         except Exception as e:
-            self.logger.error(f"Failed to initialize ETL pipeline: {e}")
+            log.error(f"Failed to initialize ETL pipeline: {e}")
             raise
     
     async def start(self):
         """Start the ETL pipeline system."""
         try:
-            self.logger.info("Starting ETL Pipeline System")
+            if self._stop.is_set():
+                log.info("Shutdown already requested, not starting")
+                return
+            
+            log.info("Starting ETL Pipeline System")
             self.is_running = True
             
-            # Start all components
+            # Start all components; the monitor was already started during
+            # initialize() and must not be started a second time
             await self.ingestion_manager.start()
             await self.etl_processor.start()
-            await self.monitor.start_monitoring()
             
-            self.logger.info("ETL Pipeline System started successfully")
+            log.info("ETL Pipeline System started successfully")
             
-            # Keep the pipeline running
-            while self.is_running:
-                await asyncio.sleep(1)
+            # Keep the pipeline running until shutdown() is requested or the
+            # ETL processor stops on an unrecoverable error
+            stop = asyncio.ensure_future(self._stop.wait())
+            failed = asyncio.ensure_future(self.etl_processor.wait_failed())
+            done, pending = await asyncio.wait({stop, failed}, return_when=asyncio.FIRST_COMPLETED)
+            for task in pending:
+                task.cancel()
+            if failed in done:
+                raise RuntimeError("ETL processor stopped") from failed.result()
                 
         except Exception as e:
-            self.logger.error(f"Error in ETL pipeline: {e}")
+            log.error(f"Error in ETL pipeline: {e}")
             await self.shutdown()
     
     async def shutdown(self):
         """Gracefully shutdown the ETL pipeline system."""
         try:
-            self.logger.info("Shutting down ETL Pipeline System")
+            log.info("Shutting down ETL Pipeline System")
             self.is_running = False
+            self._stop.set()
             
-            # Shutdown components in reverse order
-            if self.ingestion_manager:
-                await self.ingestion_manager.shutdown()
-            
-            if self.etl_processor:
-                await self.etl_processor.shutdown()
-            
-            if self.warehouse_manager:
-                await self.warehouse_manager.shutdown()
-            
-            if self.monitor:
-                await self.monitor.shutdown()
+            # Shutdown components in reverse order; each stage's components
+            # are independent and are torn down concurrently
+            await asyncio.gather(
+                _safe_shutdown("ingestion", self.ingestion_manager),
+                _safe_shutdown("processing", self.etl_processor)
+            )
+            await asyncio.gather(
+                _safe_shutdown("warehouse", self.warehouse_manager),
+                _safe_shutdown("monitoring", self.monitor)
+            )
             
-            self.logger.info("ETL Pipeline System shutdown complete")
+            log.info("ETL Pipeline System shutdown complete")
             
         except Exception as e:
-            self.logger.error(f"Error during shutdown: {e}")
+            log.error(f"Error during shutdown: {e}")
     
     def get_pipeline_status(self) -> Dict[str, Any]:
         """Get the current status of all pipeline components."""
@@ -140,31 +169,67 @@ async def main():
     """Main entry point for the ETL pipeline."""
     # Setup logging
     setup_logging()
-    logger = structlog.get_logger(__name__)
     
     # Create orchestrator
     orchestrator = ETLPipelineOrchestrator()
     
-    # Setup signal handlers for graceful shutdown
-    def signal_handler(signum, frame):
-        logger.info(f"Received signal {signum}, initiating shutdown")
-        asyncio.create_task(orchestrator.shutdown())
+    # Setup signal handlers for graceful shutdown; they run on the loop
+    # thread so the shutdown task is scheduled safely
+    loop = asyncio.get_running_loop()
+    shutdown_task = None
+    initialized = False
+    stopped_during_init = False
     
-    signal.signal(signal.SIGINT, signal_handler)
-    signal.signal(signal.SIGTERM, signal_handler)
+    def signal_handler(signum):
+        nonlocal shutdown_task, stopped_during_init
+        log.info(f"Received signal {signum}, initiating shutdown")
+        if shutdown_task is None:
+            stopped_during_init = not initialized
+            shutdown_task = asyncio.create_task(orchestrator.shutdown())
+    
+    for signum in (signal.SIGINT, signal.SIGTERM):
+        try:
+            loop.add_signal_handler(signum, signal_handler, signum)
+        except NotImplementedError:
+            # Windows event loops do not support add_signal_handler
+            signal.signal(
+                signum,
+                lambda signum, frame: loop.call_soon_threadsafe(signal_handler, signum)
+            )
     
     try:
         # Initialize and start the pipeline
         await orchestrator.initialize()
+        initialized = True
         await orchestrator.start()
         
     except KeyboardInterrupt:
-        logger.info("Received keyboard interrupt")
+        log.info("Received keyboard interrupt")
     except Exception as e:
-        logger.error(f"Unexpected error in main: {e}")
+        log.error(f"Unexpected error in main: {e}")
         sys.exit(1)
     finally:
-        await orchestrator.shutdown()
+        # Reuse a signal-triggered shutdown instead of running it twice,
+        # unless it raced initialize(): components that finished coming up
+        # after it ran still need tearing down
+        if shutdown_task is not None:
+            await shutdown_task
+            if stopped_during_init:
+                await orchestrator.shutdown()
+        else:
+            await orchestrator.shutdown()
+        
+        # Flush log records still queued for the background writer
+        stop_logging()
 
 if __name__ == "__main__":
-    asyncio.run(main())
+    # Load environment variables
+    load_env()
+    
+    # Prefer the libuv event loop where it is installed (not on Windows)
+    try:
+        import uvloop
+    except ImportError:
+        asyncio.run(main())
+    else:
+        uvloop.run(main())
@@ -9,224 +9,95 @@ import streamlit as st
 import plotly.graph_objects as go
 import plotly.express as px
 import pandas as pd
-import time
 from datetime import datetime, timedelta
 import json
 from typing import Dict, Any, List
 import numpy as np
+import jinja2
 
-# Mock data for demonstration - in real implementation, this would come from the monitoring system
-class MockMonitoringData:
-    """Mock monitoring data for demonstration purposes."""
-    
-    @staticmethod
-    def get_pipeline_status():
-        return {
-            "is_running": True,
-            "ingestion": {
-                "is_running": True,
-                "stats": {
-                    "total_records_ingested": 15420,
-                    "ingestion_errors": 3,
-                    "active_sources": ["csv", "api", "web_scraper"]
-                }
-            },
-            "processing": {
-                "is_running": True,
-                "stats": {
-                    "records_processed": 15420,
-                    "records_transformed": 15420,
-                    "records_validated": 15420,
-                    "processing_errors": 1
-                }
-            },
-            "warehouse": {
-                "is_running": True,
-                "stats": {
-                    "tables_loaded": 5,
-                    "records_loaded": 15420,
-                    "load_errors": 0
-                }
-            }
-        }
-    
-    @staticmethod
-    def get_metrics_history():
-        """Get historical metrics data."""
-        now = datetime.now()
-        hours = []
-        records_processed = []
-        processing_time = []
-        errors = []
-        
-        for i in range(24):
-            hour = now - timedelta(hours=i)
-            hours.append(hour)
-            records_processed.append(1500 + (i * 50) + (i % 3) * 100)
-            processing_time.append(0.5 + (i % 5) * 0.1)
-            errors.append(i % 3)
-        
-        return {
-            "timestamps": hours[::-1],
-            "records_processed": records_processed[::-1],
-            "processing_time": processing_time[::-1],
-            "errors": errors[::-1]
-        }
-    
-    @staticmethod
-    def get_data_quality_metrics():
-        return {
-            "completeness": 98.5,
-            "accuracy": 97.2,
-            "consistency": 99.1,
-            "timeliness": 95.8
-        }
-    
-    @staticmethod
-    def get_recent_errors():
-        return [
-            {
-                "timestamp": datetime.now() - timedelta(minutes=5),
-                "error_type": "Data Validation Error",
-                "message": "Missing required field 'customer_id'",
-                "severity": "WARNING"
-            },
-            {
-                "timestamp": datetime.now() - timedelta(minutes=15),
-                "error_type": "Processing Error",
-                "message": "Failed to transform record due to invalid date format",
-                "severity": "ERROR"
-            },
-            {
-                "timestamp": datetime.now() - timedelta(minutes=30),
-                "error_type": "Connection Error",
-                "message": "Temporary connection issue with Kafka",
-                "severity": "INFO"
-            }
-        ]
+# How long mock monitoring data is reused across reruns; matches the
+# default refresh rate so each refresh tick computes the data once
+CACHE_TTL_SECONDS = 10
 
-def create_gradient_gauge(value, title, color_scheme="viridis"):
-    """Create a beautiful gradient gauge chart."""
-    fig = go.Figure(go.Indicator(
-        mode="gauge+number+delta",
-        value=value,
-        domain={'x': [0, 1], 'y': [0, 1]},
-        title={'text': title, 'font': {'size': 20, 'color': '#2c3e50'}},
-        delta={'reference': 90, 'increasing': {'color': "#3498db"}},
-        gauge={
-            'axis': {'range': [None, 100], 'tickwidth': 1, 'tickcolor': "#2c3e50"},
-            'bar': {'color': "#3498db"},
-            'bgcolor': "rgba(52, 152, 219, 0.1)",
-            'borderwidth': 2,
-            'bordercolor': "#3498db",
-            'steps': [
-                {'range': [0, 50], 'color': '#e74c3c'},
-                {'range': [50, 80], 'color': '#f39c12'},
-                {'range': [80, 100], 'color': '#27ae60'}
-            ],
-            'threshold': {
-                'line': {'color': "red", 'width': 4},
-                'thickness': 0.75,
-                'value': 90
-            }
-        }
-    ))
-    
-    fig.update_layout(
-        height=300,
-        paper_bgcolor='rgba(0,0,0,0)',
-        plot_bgcolor='rgba(0,0,0,0)',
-        font={'color': '#2c3e50'},
-        margin=dict(l=20, r=20, t=40, b=20)
-    )
-    return fig
+# Upper bound on points sent to the browser per line chart; longer series
+# are downsampled with LTTB so front-end render time stays flat
+MAX_CHART_POINTS = 1000
 
-def create_animated_line_chart(df, x_col, y_col, title, color="#3498db"):
-    """Create an animated line chart with gradient fill."""
-    fig = go.Figure()
-    
-    fig.add_trace(go.Scatter(
-        x=df[x_col],
-        y=df[y_col],
-        mode='lines+markers',
-        line=dict(color=color, width=3),
-        marker=dict(size=6, color=color),
-        fill='tonexty',
-        fillcolor=f'rgba(52, 152, 219, 0.1)',
-        name=y_col
-    ))
-    
-    fig.update_layout(
-        title=dict(text=title, font=dict(size=20, color='#2c3e50')),
-        xaxis=dict(
-            title="Time",
-            gridcolor='rgba(44, 62, 80, 0.1)',
-            zerolinecolor='rgba(44, 62, 80, 0.1)',
-            tickfont=dict(color='#2c3e50')
-        ),
-        yaxis=dict(
-            title=y_col,
-            gridcolor='rgba(44, 62, 80, 0.1)',
-            zerolinecolor='rgba(44, 62, 80, 0.1)',
-            tickfont=dict(color='#2c3e50')
-        ),
-        paper_bgcolor='rgba(0,0,0,0)',
-        plot_bgcolor='rgba(0,0,0,0)',
-        height=400,
-        margin=dict(l=40, r=40, t=60, b=40)
-    )
-    
-    return fig
+# Plotly config for charts with nothing to hover or zoom; skips event
+# binding and the mode bar in the browser
+STATIC_PLOT_CONFIG = {'staticPlot': True, 'displayModeBar': False}
 
-def create_radar_chart(quality_metrics):
-    """Create a radar chart for data quality metrics."""
-    categories = list(quality_metrics.keys())
-    values = list(quality_metrics.values())
-    
-    fig = go.Figure()
-    
-    fig.add_trace(go.Scatterpolar(
-        r=values,
-        theta=categories,
-        fill='toself',
-        fillcolor='rgba(52, 152, 219, 0.3)',
-        line_color='#3498db',
-        line_width=3,
-        name='Data Quality'
-    ))
-    
-    fig.update_layout(
-        polar=dict(
-            radialaxis=dict(
-                visible=True,
-                range=[0, 100],
-                tickfont=dict(color='#2c3e50'),
-                gridcolor='rgba(44, 62, 80, 0.1)'
-            ),
-            angularaxis=dict(
-                tickfont=dict(color='#2c3e50')
-            )
-        ),
-        showlegend=False,
-        paper_bgcolor='rgba(0,0,0,0)',
-        plot_bgcolor='rgba(0,0,0,0)',
-        height=400,
-        title=dict(text="Data Quality Overview", font=dict(size=20, color='#2c3e50'))
-    )
-    
-    return fig
+# Indicator icon and background colour for each error severity in the
+# alerts table
+SEVERITY_ICONS = {
+    "ERROR": "🔴",
+    "WARNING": "🟡",
+    "INFO": "🔵",
+}
 
-def main():
-    """Main dashboard function."""
-    st.set_page_config(
-        page_title="🚀 ETL Pipeline Monitor",
-        page_icon="🚀",
-        layout="wide",
-        initial_sidebar_state="expanded"
-    )
-    
-    # Custom CSS for stunning light theme with soft gradients and animations
-    st.markdown("""
+SEVERITY_STYLES = {
+    "ERROR": "background-color: #fbeaea",
+    "WARNING": "background-color: #fdf3e0",
+    "INFO": "background-color: #e8f4fb",
+}
+
+# HTML card templates, compiled once at import and rendered on each rerun.
+# Values are internal, and some contain markup, so autoescaping is off
+_TEMPLATES = jinja2.Environment(
+    loader=jinja2.DictLoader({
+        "status_grid": """
+<div class="status-grid">
+{% for title, status, highlight, text in cards %}
+<div class="metric-card">
+<h3 class="card-title">{{ title }}</h3>
+<p><span class="status-indicator status-running"></span><strong class="status-text-running">{{ status }}</strong></p>
+<p class="card-highlight">{{ highlight }}</p>
+<p class="card-text">{{ text }}</p>
+</div>
+{% endfor %}
+</div>
+""",
+        "config_grid": """
+<div class="status-grid config-grid">
+{% for title, items in cards %}
+<div class="metric-card">
+<h3 class="config-title">{{ title }}</h3>
+{% for item in items %}
+<p class="card-highlight">{{ item }}</p>
+{% endfor %}
+</div>
+{% endfor %}
+</div>
+""",
+        "quality_scores": """
+{% for metric, value in metrics %}
+<div class="quality-score-card">
+<h4>{{ metric | title }}</h4>
+<p>{{ value }}%</p>
+</div>
+{% endfor %}
+""",
+        "footer": """
+<div class="footer">
+<h3>🚀 ETL Pipeline Monitoring Dashboard</h3>
+<p>Built with ❤️ using Streamlit & Plotly</p>
+<p>Last updated: {{ updated }}</p>
+</div>
+""",
+    }),
+    autoescape=False,
+    auto_reload=False,
+    trim_blocks=True,
+    lstrip_blocks=True,
+    cache_size=-1
+)
+STATUS_GRID_TEMPLATE = _TEMPLATES.get_template("status_grid")
+CONFIG_GRID_TEMPLATE = _TEMPLATES.get_template("config_grid")
+QUALITY_SCORES_TEMPLATE = _TEMPLATES.get_template("quality_scores")
+FOOTER_TEMPLATE = _TEMPLATES.get_template("footer")
+
+# Page stylesheet, built once at import instead of on every rerun
+CSS_BLOB = """
     <style>
     @import url('https://fonts.googleapis.com/css2?family=Poppins:wght@300;400;600;700&display=swap');
     
@@ -269,6 +140,16 @@ def main():
         box-shadow: 0 8px 32px rgba(52, 152, 219, 0.15);
     }
     
+    .status-grid {
+        display: grid;
+        grid-template-columns: repeat(4, 1fr);
+        gap: 1rem;
+    }
+    
+    .config-grid {
+        grid-template-columns: repeat(2, 1fr);
+    }
+    
     .metric-card:hover {
         transform: translateY(-5px);
         box-shadow: 0 12px 40px rgba(52, 152, 219, 0.25);
@@ -315,33 +196,6 @@ def main():
         text-shadow: 0 2px 4px rgba(44, 62, 80, 0.1);
     }
     
-    .error-card {
-        background: linear-gradient(135deg, rgba(231, 76, 60, 0.1) 0%, rgba(192, 57, 43, 0.1) 100%);
-        border: 2px solid rgba(231, 76, 60, 0.3);
-        border-radius: 15px;
-        padding: 1rem;
-        margin: 0.5rem 0;
-        backdrop-filter: blur(10px);
-    }
-    
-    .warning-card {
-        background: linear-gradient(135deg, rgba(243, 156, 18, 0.1) 0%, rgba(230, 126, 34, 0.1) 100%);
-        border: 2px solid rgba(243, 156, 18, 0.3);
-        border-radius: 15px;
-        padding: 1rem;
-        margin: 0.5rem 0;
-        backdrop-filter: blur(10px);
-    }
-    
-    .info-card {
-        background: linear-gradient(135deg, rgba(52, 152, 219, 0.1) 0%, rgba(41, 128, 185, 0.1) 100%);
-        border: 2px solid rgba(52, 152, 219, 0.3);
-        border-radius: 15px;
-        padding: 1rem;
-        margin: 0.5rem 0;
-        backdrop-filter: blur(10px);
-    }
-    
     .sidebar .sidebar-content {
         background: linear-gradient(180deg, #ffffff 0%, #f1f3f4 100%);
         border-right: 2px solid rgba(52, 152, 219, 0.3);
@@ -412,224 +266,512 @@ def main():
         transform: translateY(-2px);
         box-shadow: 0 8px 25px rgba(52, 152, 219, 0.2);
     }
+    
+    .sidebar-title {
+        color: #2c3e50;
+        font-family: 'Poppins', sans-serif;
+        font-weight: 600;
+    }
+    
+    .sidebar-subheader {
+        color: #2c3e50;
+        font-size: 1.2rem;
+        font-weight: 500;
+    }
+    
+    .card-title {
+        color: #2c3e50;
+        font-size: 1.3rem;
+        font-weight: 600;
+    }
+    
+    .config-title {
+        color: #2c3e50;
+        margin-bottom: 1rem;
+        font-weight: 600;
+    }
+    
+    .card-highlight {
+        color: #3498db;
+        font-weight: 500;
+    }
+    
+    .card-text {
+        color: #2c3e50;
+    }
+    
+    .status-text-running {
+        color: #27ae60;
+    }
+    
+    .quality-scores-title {
+        color: #2c3e50;
+        text-align: center;
+        font-weight: 600;
+    }
+    
+    .quality-score-card h4 {
+        color: #2c3e50;
+        margin: 0;
+        font-weight: 600;
+    }
+    
+    .quality-score-card p {
+        color: #3498db;
+        font-size: 1.5rem;
+        font-weight: bold;
+        margin: 0;
+    }
+    
+    .footer h3 {
+        color: #2c3e50;
+        font-family: 'Poppins', sans-serif;
+        font-weight: 600;
+    }
+    
+    .footer p {
+        color: #7f8c8d;
+    }
     </style>
-    """, unsafe_allow_html=True)
+"""
+
+# Mock data for demonstration - in real implementation, this would come from the monitoring system
+class MockMonitoringData:
+    """Mock monitoring data for demonstration purposes."""
     
-    # Header with animated gradient
-    st.markdown('<h1 class="main-header">🚀 ETL Pipeline Monitoring Dashboard</h1>', unsafe_allow_html=True)
+    @staticmethod
+    @st.cache_data(ttl=CACHE_TTL_SECONDS)
+    def get_pipeline_status():
+        return {
+            "is_running": True,
+            "ingestion": {
+                "is_running": True,
+                "stats": {
+                    "total_records_ingested": 15420,
+                    "ingestion_errors": 3,
+                    "active_sources": ["csv", "api", "web_scraper"]
+                }
+            },
+            "processing": {
+                "is_running": True,
+                "stats": {
+                    "records_processed": 15420,
+                    "records_transformed": 15420,
+                    "records_validated": 15420,
+                    "processing_errors": 1
+                }
+            },
+            "warehouse": {
+                "is_running": True,
+                "stats": {
+                    "tables_loaded": 5,
+                    "records_loaded": 15420,
+                    "load_errors": 0
+                }
+            }
+        }
     
-    # Sidebar with enhanced styling
-    with st.sidebar:
-        st.markdown('<h2 style="color: #2c3e50; font-family: \'Poppins\', sans-serif; font-weight: 600;">🎛️ Control Panel</h2>', unsafe_allow_html=True)
-        
-        # Refresh rate with custom styling
-        st.markdown('<h3 style="color: #2c3e50; font-size: 1.2rem; font-weight: 500;">⚡ Refresh Settings</h3>', unsafe_allow_html=True)
-        refresh_rate = st.selectbox(
-            "🔄 Refresh Rate",
-            ["5 seconds", "10 seconds", "30 seconds", "1 minute"],
-            index=1
-        )
-        
-        # Auto-refresh toggle
-        auto_refresh = st.checkbox("🔄 Auto-refresh", value=True)
-        
-        st.markdown('<h3 style="color: #2c3e50; font-size: 1.2rem; font-weight: 500;">🎮 Pipeline Controls</h3>', unsafe_allow_html=True)
-        
-        # Pipeline control buttons
-        col1, col2 = st.columns(2)
-        with col1:
-            if st.button("🟢 Start Pipeline", type="primary"):
-                st.success("🚀 Pipeline started successfully!")
-        
-        with col2:
-            if st.button("🔴 Stop Pipeline"):
-                st.error("⏹️ Pipeline stopped!")
-        
-        st.markdown('<h3 style="color: #2c3e50; font-size: 1.2rem; font-weight: 500;">📊 Quick Stats</h3>', unsafe_allow_html=True)
-        
-        # Quick stats in sidebar
-        mock_data = MockMonitoringData()
-        status = mock_data.get_pipeline_status()
+    @staticmethod
+    @st.cache_data(ttl=CACHE_TTL_SECONDS)
+    def get_metrics_history():
+        """Get historical metrics data, oldest first, as numpy-backed arrays."""
+        # Hours ago for each point, already in oldest-first order
+        hours_ago = np.arange(23, -1, -1)
         
-        st.metric("📈 Total Records", f"{status['ingestion']['stats']['total_records_ingested']:,}")
-        st.metric("⚡ Processing Rate", "1,500 records/min")
-        st.metric("⚠️ Error Rate", f"{status['processing']['stats']['processing_errors']} errors")
+        return {
+            "timestamps": pd.Timestamp.now() - pd.to_timedelta(hours_ago, unit='h'),
+            "records_processed": 1500 + hours_ago * 50 + (hours_ago % 3) * 100,
+            "processing_time": 0.5 + (hours_ago % 5) * 0.1,
+            "errors": hours_ago % 3
+        }
+    
+    @staticmethod
+    @st.cache_data(ttl=CACHE_TTL_SECONDS)
+    def get_data_quality_metrics():
+        return {
+            "completeness": 98.5,
+            "accuracy": 97.2,
+            "consistency": 99.1,
+            "timeliness": 95.8
+        }
+    
+    @staticmethod
+    def get_recent_errors():
+        return [
+            {
+                "timestamp": datetime.now() - timedelta(minutes=5),
+                "error_type": "Data Validation Error",
+                "message": "Missing required field 'customer_id'",
+                "severity": "WARNING"
+            },
+            {
+                "timestamp": datetime.now() - timedelta(minutes=15),
+                "error_type": "Processing Error",
+                "message": "Failed to transform record due to invalid date format",
+                "severity": "ERROR"
+            },
+            {
+                "timestamp": datetime.now() - timedelta(minutes=30),
+                "error_type": "Connection Error",
+                "message": "Temporary connection issue with Kafka",
+                "severity": "INFO"
+            }
+        ]
+
+def _as_numeric(values):
+    """Return values as a float array, converting datetimes to epoch nanoseconds."""
+    arr = np.asarray(values)
+    if arr.dtype.kind in "iuf":
+        return arr.astype(float)
+    return pd.to_datetime(arr).asi8.astype(float)
+
+def lttb_indices(x, y, threshold=MAX_CHART_POINTS):
+    """
+    Pick the indices of at most `threshold` points that preserve the visual
+    shape of a series, using Largest-Triangle-Three-Buckets.
+    
+    The first and last points are always kept; every bucket in between
+    contributes the point forming the largest triangle with the previously
+    selected point and the average of the next bucket.
+    """
+    n = len(x)
+    if threshold >= n or threshold < 3:
+        return np.arange(n)
+    
+    x = _as_numeric(x)
+    y = np.asarray(y, dtype=float)
+    
+    edges = np.linspace(1, n - 1, threshold - 1).astype(int)
+    indices = np.empty(threshold, dtype=int)
+    indices[0], indices[-1] = 0, n - 1
+    
+    a = 0
+    for i in range(threshold - 2):
+        start, end = edges[i], edges[i + 1]
+        if i == threshold - 3:
+            avg_x, avg_y = x[-1], y[-1]
+        else:
+            next_end = edges[i + 2]
+            avg_x = x[end:next_end].mean()
+            avg_y = y[end:next_end].mean()
         
-        # Add a beautiful gauge for overall health
-        st.markdown('<h3 style="color: #2c3e50; font-size: 1.2rem; font-weight: 500;">🏥 System Health</h3>', unsafe_allow_html=True)
-        health_score = 95.5
-        fig_gauge = create_gradient_gauge(health_score, "System Health Score")
-        st.plotly_chart(fig_gauge, use_container_width=True)
+        area = np.abs(
+            (x[a] - avg_x) * (y[start:end] - y[a])
+            - (x[a] - x[start:end]) * (avg_y - y[a])
+        )
+        a = start + int(area.argmax())
+        indices[i + 1] = a
     
-    # Main content area with enhanced cards
-    st.markdown('<h2 class="section-header">📊 Pipeline Status Overview</h2>', unsafe_allow_html=True)
+    return indices
+
+# Layout shared by every chart of a kind, built once at import; the
+# builders below only add the parts that vary per chart
+_GAUGE_LAYOUT = dict(
+    height=300,
+    paper_bgcolor='rgba(0,0,0,0)',
+    plot_bgcolor='rgba(0,0,0,0)',
+    font={'color': '#2c3e50'},
+    margin=dict(l=20, r=20, t=40, b=20)
+)
+
+_LINE_LAYOUT = dict(
+    xaxis=dict(
+        title="Time",
+        gridcolor='rgba(44, 62, 80, 0.1)',
+        zerolinecolor='rgba(44, 62, 80, 0.1)',
+        tickfont=dict(color='#2c3e50')
+    ),
+    yaxis=dict(
+        gridcolor='rgba(44, 62, 80, 0.1)',
+        zerolinecolor='rgba(44, 62, 80, 0.1)',
+        tickfont=dict(color='#2c3e50')
+    ),
+    paper_bgcolor='rgba(0,0,0,0)',
+    plot_bgcolor='rgba(0,0,0,0)',
+    height=400,
+    margin=dict(l=40, r=40, t=60, b=40)
+)
+
+_RADAR_LAYOUT = dict(
+    polar=dict(
+        radialaxis=dict(
+            visible=True,
+            range=[0, 100],
+            tickfont=dict(color='#2c3e50'),
+            gridcolor='rgba(44, 62, 80, 0.1)'
+        ),
+        angularaxis=dict(
+            tickfont=dict(color='#2c3e50')
+        )
+    ),
+    showlegend=False,
+    paper_bgcolor='rgba(0,0,0,0)',
+    plot_bgcolor='rgba(0,0,0,0)',
+    height=400,
+    title=dict(text="Data Quality Overview", font=dict(size=20, color='#2c3e50'))
+)
+
+# Chart builders are cached on their (hashable) inputs so unchanged data
+# reuses the already-built figure instead of rebuilding it every rerun
+@st.cache_resource(max_entries=32)
+def create_gradient_gauge(value, title, color_scheme="viridis"):
+    """Create a beautiful gradient gauge chart."""
+    fig = go.Figure(go.Indicator(
+        mode="gauge+number+delta",
+        value=value,
+        domain={'x': [0, 1], 'y': [0, 1]},
+        title={'text': title, 'font': {'size': 20, 'color': '#2c3e50'}},
+        delta={'reference': 90, 'increasing': {'color': "#3498db"}},
+        gauge={
+            'axis': {'range': [None, 100], 'tickwidth': 1, 'tickcolor': "#2c3e50"},
+            'bar': {'color': "#3498db"},
+            'bgcolor': "rgba(52, 152, 219, 0.1)",
+            'borderwidth': 2,
+            'bordercolor': "#3498db",
+            'steps': [
+                {'range': [0, 50], 'color': '#e74c3c'},
+                {'range': [50, 80], 'color': '#f39c12'},
+                {'range': [80, 100], 'color': '#27ae60'}
+            ],
+            'threshold': {
+                'line': {'color': "red", 'width': 4},
+                'thickness': 0.75,
+                'value': 90
+            }
+        }
+    ))
+    
+    fig.update_layout(_GAUGE_LAYOUT)
+    return fig
+
+@st.cache_resource(max_entries=32)
+def create_animated_line_chart(x, y, y_label, title, color="#3498db"):
+    """Create an animated line chart with gradient fill from x/y tuples."""
+    if len(x) > MAX_CHART_POINTS:
+        keep = lttb_indices(x, y, MAX_CHART_POINTS)
+        x = [x[i] for i in keep]
+        y = [y[i] for i in keep]
     
-    col1, col2, col3, col4 = st.columns(4)
+    fig = go.Figure()
     
-    with col1:
-        st.markdown("""
-        <div class="metric-card">
-            <h3 style="color: #2c3e50; font-size: 1.3rem; font-weight: 600;">📥 Data Ingestion</h3>
-            <p><span class="status-indicator status-running"></span><strong style="color: #27ae60;">Active</strong></p>
-            <p style="color: #3498db; font-weight: 500;">Sources: 3</p>
-            <p style="color: #2c3e50;">Records: 15,420</p>
-        </div>
-        """, unsafe_allow_html=True)
+    fig.add_trace(go.Scattergl(
+        x=x,
+        y=y,
+        mode='lines+markers',
+        line=dict(color=color, width=3),
+        marker=dict(size=6, color=color),
+        fill='tonexty',
+        fillcolor=f'rgba(52, 152, 219, 0.1)',
+        name=y_label
+    ))
     
-    with col2:
-        st.markdown("""
-        <div class="metric-card">
-            <h3 style="color: #2c3e50; font-size: 1.3rem; font-weight: 600;">⚙️ Data Processing</h3>
-            <p><span class="status-indicator status-running"></span><strong style="color: #27ae60;">Active</strong></p>
-            <p style="color: #3498db; font-weight: 500;">Transformed: 15,420</p>
-            <p style="color: #2c3e50;">Validated: 15,420</p>
-        </div>
-        """, unsafe_allow_html=True)
-    
-    with col3:
-        st.markdown("""
-        <div class="metric-card">
-            <h3 style="color: #2c3e50; font-size: 1.3rem; font-weight: 600;">💾 Data Warehouse</h3>
-            <p><span class="status-indicator status-running"></span><strong style="color: #27ae60;">Active</strong></p>
-            <p style="color: #3498db; font-weight: 500;">Tables: 5</p>
-            <p style="color: #2c3e50;">Loaded: 15,420</p>
-        </div>
-        """, unsafe_allow_html=True)
-    
-    with col4:
-        st.markdown("""
-        <div class="metric-card">
-            <h3 style="color: #2c3e50; font-size: 1.3rem; font-weight: 600;">📊 Data Quality</h3>
-            <p><span class="status-indicator status-running"></span><strong style="color: #27ae60;">Excellent</strong></p>
-            <p style="color: #3498db; font-weight: 500;">Score: 98.5%</p>
-            <p style="color: #2c3e50;">Errors: 1</p>
-        </div>
-        """, unsafe_allow_html=True)
+    fig.update_layout(_LINE_LAYOUT)
+    fig.update_layout(
+        title=dict(text=title, font=dict(size=20, color='#2c3e50')),
+        yaxis_title=y_label
+    )
+    
+    return fig
+
+@st.cache_resource(max_entries=32)
+def create_radar_chart(quality_metrics):
+    """Create a radar chart from (metric, value) pairs of data quality metrics."""
+    categories = [metric for metric, _ in quality_metrics]
+    values = [value for _, value in quality_metrics]
+    
+    fig = go.Figure()
+    
+    fig.add_trace(go.Scatterpolar(
+        r=values,
+        theta=categories,
+        fill='toself',
+        fillcolor='rgba(52, 152, 219, 0.3)',
+        line_color='#3498db',
+        line_width=3,
+        name='Data Quality'
+    ))
+    
+    fig.update_layout(_RADAR_LAYOUT)
+    
+    return fig
+
+def _refresh_seconds(refresh_rate: str) -> int:
+    """Convert a refresh rate label like "10 seconds" to seconds."""
+    return int(refresh_rate.split()[0]) * (1 if "second" in refresh_rate else 60)
+
+def render_sidebar_stats():
+    """Render the live quick stats and health gauge in the sidebar."""
+    # Quick stats in sidebar
+    status = MockMonitoringData.get_pipeline_status()
+    
+    st.metric("📈 Total Records", f"{status['ingestion']['stats']['total_records_ingested']:,}")
+    st.metric("⚡ Processing Rate", "1,500 records/min")
+    st.metric("⚠️ Error Rate", f"{status['processing']['stats']['processing_errors']} errors")
+    
+    # Add a beautiful gauge for overall health
+    st.markdown('<h3 class="sidebar-subheader">🏥 System Health</h3>', unsafe_allow_html=True)
+    health_score = 95.5
+    fig_gauge = create_gradient_gauge(health_score, "System Health Score")
+    st.plotly_chart(fig_gauge, use_container_width=True, config=STATIC_PLOT_CONFIG)
+
+def render_status_cards():
+    """Render the pipeline status overview cards."""
+    # Main content area with enhanced cards
+    st.markdown('<h2 class="section-header">📊 Pipeline Status Overview</h2>', unsafe_allow_html=True)
     
+    cards = [
+        ("📥 Data Ingestion", "Active", "Sources: 3", "Records: 15,420"),
+        ("⚙️ Data Processing", "Active", "Transformed: 15,420", "Validated: 15,420"),
+        ("💾 Data Warehouse", "Active", "Tables: 5", "Loaded: 15,420"),
+        ("📊 Data Quality", "Excellent", "Score: 98.5%", "Errors: 1"),
+    ]
+    st.markdown(STATUS_GRID_TEMPLATE.render(cards=cards), unsafe_allow_html=True)
+
+def render_charts():
+    """Render the performance and data quality charts."""
     # Enhanced charts section
     st.markdown('<h2 class="section-header">📈 Real-time Performance Metrics</h2>', unsafe_allow_html=True)
     
+    # Fetched once and shared by both performance charts
+    metrics = MockMonitoringData.get_metrics_history()
+    
     col1, col2 = st.columns(2)
     
     with col1:
         # Records processed over time with enhanced styling
-        mock_data = MockMonitoringData()
-        metrics = mock_data.get_metrics_history()
-        
-        df = pd.DataFrame({
-            'Time': metrics['timestamps'],
-            'Records Processed': metrics['records_processed']
-        })
-        
-        fig = create_animated_line_chart(df, 'Time', 'Records Processed', '📈 Records Processed Over Time')
+        fig = create_animated_line_chart(
+            tuple(metrics['timestamps']), tuple(metrics['records_processed']),
+            'Records Processed', '📈 Records Processed Over Time'
+        )
         st.plotly_chart(fig, use_container_width=True)
     
     with col2:
         # Processing time over time
-        df_time = pd.DataFrame({
-            'Time': metrics['timestamps'],
-            'Processing Time (s)': metrics['processing_time']
-        })
-        
-        fig = create_animated_line_chart(df_time, 'Time', 'Processing Time (s)', '⚡ Processing Time Over Time', "#9b59b6")
+        fig = create_animated_line_chart(
+            tuple(metrics['timestamps']), tuple(metrics['processing_time']),
+            'Processing Time (s)', '⚡ Processing Time Over Time', "#9b59b6"
+        )
         st.plotly_chart(fig, use_container_width=True)
     
     # Data Quality Metrics with radar chart
     st.markdown('<h2 class="section-header">🔍 Data Quality Analysis</h2>', unsafe_allow_html=True)
     
-    quality_metrics = mock_data.get_data_quality_metrics()
+    quality_metrics = MockMonitoringData.get_data_quality_metrics()
     
     col1, col2 = st.columns([2, 1])
     
     with col1:
         # Radar chart for data quality
-        fig_radar = create_radar_chart(quality_metrics)
-        st.plotly_chart(fig_radar, use_container_width=True)
+        fig_radar = create_radar_chart(tuple(quality_metrics.items()))
+        st.plotly_chart(fig_radar, use_container_width=True, config=STATIC_PLOT_CONFIG)
     
     with col2:
         # Individual quality metrics with enhanced styling
-        st.markdown('<h3 style="color: #2c3e50; text-align: center; font-weight: 600;">Quality Scores</h3>', unsafe_allow_html=True)
+        st.markdown('<h3 class="quality-scores-title">Quality Scores</h3>', unsafe_allow_html=True)
         
-        for metric, value in quality_metrics.items():
-            st.markdown(f"""
-            <div class="quality-score-card">
-                <h4 style="color: #2c3e50; margin: 0; font-weight: 600;">{metric.title()}</h4>
-                <p style="color: #3498db; font-size: 1.5rem; font-weight: bold; margin: 0;">{value}%</p>
-            </div>
-            """, unsafe_allow_html=True)
-    
+        st.markdown(
+            QUALITY_SCORES_TEMPLATE.render(metrics=quality_metrics.items()),
+            unsafe_allow_html=True
+        )
+
+def render_errors():
+    """Render the recent errors and alerts."""
     # Recent Errors with enhanced styling
     st.markdown('<h2 class="section-header">⚠️ Recent Errors & Alerts</h2>', unsafe_allow_html=True)
     
-    errors = mock_data.get_recent_errors()
+    errors = MockMonitoringData.get_recent_errors()
+    
+    errors_df = pd.DataFrame(errors)[["timestamp", "severity", "error_type", "message"]]
+    errors_df["timestamp"] = errors_df["timestamp"].dt.strftime('%H:%M:%S')
+    errors_df.insert(0, "", errors_df["severity"].map(SEVERITY_ICONS).fillna("⚪"))
+    styled = errors_df.style.map(
+        lambda severity: SEVERITY_STYLES.get(severity, ''), subset=['severity']
+    )
+    
+    # One dataframe delta instead of one markdown block per error
+    st.dataframe(styled, use_container_width=True, hide_index=True)
+
+def render_footer():
+    """Render the footer with the last update time."""
+    # Footer with enhanced styling
+    st.markdown(
+        FOOTER_TEMPLATE.render(updated=datetime.now().strftime("%Y-%m-%d %H:%M:%S")),
+        unsafe_allow_html=True
+    )
+
+def main():
+    """Main dashboard function."""
+    st.set_page_config(
+        page_title="🚀 ETL Pipeline Monitor",
+        page_icon="🚀",
+        layout="wide",
+        initial_sidebar_state="expanded"
+    )
+    
+    # Custom CSS for stunning light theme with soft gradients and animations
+    st.markdown(CSS_BLOB, unsafe_allow_html=True)
+    
+    # Header with animated gradient
+    st.markdown('<h1 class="main-header">🚀 ETL Pipeline Monitoring Dashboard</h1>', unsafe_allow_html=True)
     
-    for error in errors:
-        severity_color = {
-            "ERROR": "🔴",
-            "WARNING": "🟡", 
-            "INFO": "🔵"
-        }.get(error['severity'], "⚪")
+    # Sidebar with enhanced styling
+    with st.sidebar:
+        st.markdown('<h2 class="sidebar-title">🎛️ Control Panel</h2>', unsafe_allow_html=True)
+        
+        # Refresh rate with custom styling
+        st.markdown('<h3 class="sidebar-subheader">⚡ Refresh Settings</h3>', unsafe_allow_html=True)
+        refresh_rate = st.selectbox(
+            "🔄 Refresh Rate",
+            ["5 seconds", "10 seconds", "30 seconds", "1 minute"],
+            index=1
+        )
+        
+        # Auto-refresh toggle
+        auto_refresh = st.checkbox("🔄 Auto-refresh", value=True)
+        run_every = _refresh_seconds(refresh_rate) if auto_refresh else None
+        
+        st.markdown('<h3 class="sidebar-subheader">🎮 Pipeline Controls</h3>', unsafe_allow_html=True)
+        
+        # Pipeline control buttons
+        col1, col2 = st.columns(2)
+        with col1:
+            if st.button("🟢 Start Pipeline", type="primary"):
+                st.success("🚀 Pipeline started successfully!")
         
-        card_class = {
-            "ERROR": "error-card",
-            "WARNING": "warning-card",
-            "INFO": "info-card"
-        }.get(error['severity'], "info-card")
+        with col2:
+            if st.button("🔴 Stop Pipeline"):
+                st.error("⏹️ Pipeline stopped!")
+        
+        st.markdown('<h3 class="sidebar-subheader">📊 Quick Stats</h3>', unsafe_allow_html=True)
         
-        st.markdown(f"""
-        <div class="{card_class}">
-            <h4 style="color: #2c3e50; margin: 0 0 0.5rem 0; font-weight: 600;">
-                {severity_color} {error['error_type']}
-            </h4>
-            <p style="color: #7f8c8d; margin: 0 0 0.5rem 0;">
-                <strong>Time:</strong> {error['timestamp'].strftime('%H:%M:%S')}
-            </p>
-            <p style="color: #2c3e50; margin: 0;">
-                {error['message']}
-            </p>
-        </div>
-        """, unsafe_allow_html=True)
+        # Live sections re-run on their own on every refresh tick; the
+        # CSS, header and controls above are only rendered once
+        st.fragment(render_sidebar_stats, run_every=run_every)()
+    
+    st.fragment(render_status_cards, run_every=run_every)()
+    st.fragment(render_charts, run_every=run_every)()
+    st.fragment(render_errors, run_every=run_every)()
     
     # Pipeline Configuration with enhanced styling
     st.markdown('<h2 class="section-header">⚙️ Pipeline Configuration</h2>', unsafe_allow_html=True)
     
-    col1, col2 = st.columns(2)
-    
-    with col1:
-        st.markdown("""
-        <div class="metric-card">
-            <h3 style="color: #2c3e50; margin-bottom: 1rem; font-weight: 600;">📡 Data Sources</h3>
-            <p style="color: #3498db; font-weight: 500;">📁 CSV Files: <code>/data/input/</code></p>
-            <p style="color: #3498db; font-weight: 500;">🌐 API Endpoints: 3 active</p>
-            <p style="color: #3498db; font-weight: 500;">🕷️ Web Scraping: 2 sources</p>
-            <p style="color: #3498db; font-weight: 500;">📱 IoT Devices: 5 connected</p>
-        </div>
-        """, unsafe_allow_html=True)
-    
-    with col2:
-        st.markdown("""
-        <div class="metric-card">
-            <h3 style="color: #2c3e50; margin-bottom: 1rem; font-weight: 600;">⚙️ Processing Settings</h3>
-            <p style="color: #3498db; font-weight: 500;">📦 Batch Size: 1,000 records</p>
-            <p style="color: #3498db; font-weight: 500;">👥 Processing Workers: 4</p>
-            <p style="color: #3498db; font-weight: 500;">🔄 Retry Attempts: 3</p>
-            <p style="color: #3498db; font-weight: 500;">⏱️ Timeout: 30 seconds</p>
-        </div>
-        """, unsafe_allow_html=True)
-    
-    # Footer with enhanced styling
-    st.markdown("""
-    <div class="footer">
-        <h3 style="color: #2c3e50; font-family: 'Poppins', sans-serif; font-weight: 600;">🚀 ETL Pipeline Monitoring Dashboard</h3>
-        <p style="color: #7f8c8d;">Built with ❤️ using Streamlit & Plotly</p>
-        <p style="color: #7f8c8d;">Last updated: {}</p>
-    </div>
-    """.format(datetime.now().strftime("%Y-%m-%d %H:%M:%S")), unsafe_allow_html=True)
-    
-    # Auto-refresh functionality
-    if auto_refresh:
-        time.sleep(int(refresh_rate.split()[0]) * (1 if "second" in refresh_rate else 60))
-        st.rerun()
+    cards = [
+        ("📡 Data Sources", [
+            "📁 CSV Files: <code>/data/input/</code>",
+            "🌐 API Endpoints: 3 active",
+            "🕷️ Web Scraping: 2 sources",
+            "📱 IoT Devices: 5 connected",
+        ]),
+        ("⚙️ Processing Settings", [
+            "📦 Batch Size: 1,000 records",
+            "👥 Processing Workers: 4",
+            "🔄 Retry Attempts: 3",
+            "⏱️ Timeout: 30 seconds",
+        ]),
+    ]
+    st.markdown(CONFIG_GRID_TEMPLATE.render(cards=cards), unsafe_allow_html=True)
+    
+    st.fragment(render_footer, run_every=run_every)()
 
 if __name__ == "__main__":
-    main()
+    main()
\ No newline at end of file
@@ -6,52 +6,182 @@ Handles data transformation, validation, and loading into the data warehouse.
 """
 
 import asyncio
-import json
+import functools
 import time
-from typing import Dict, Any, List, Optional
+from concurrent.futures import ThreadPoolExecutor
+from typing import Dict, Any, List, Optional, Tuple
 from datetime import datetime
 
+import numpy as np
 import structlog
-from kafka import KafkaConsumer, KafkaProducer
+from confluent_kafka import Consumer, KafkaError, KafkaException, Producer, TopicPartition
 import pandas as pd
 
+from src.utils.config_manager import get_config
 from src.utils.logger_setup import PipelineLogger
+from src.utils.serialization import (
+    MISSING_KEY, deserialize_value, expand_message, get_value_serializer, record_key,
+    serialize_key, serialize_value
+)
 from src.processing.data_transformer import DataTransformer
 from src.processing.data_validator import DataValidator
 from src.processing.data_enricher import DataEnricher
+from src.processing.schema_compiler import (
+    FrameValidator, RecordValidator, compile_frame_validator, compile_validator
+)
+
+# Batches buffered between consecutive pipeline stages
+STAGE_QUEUE_SIZE = 4
+
+# Stages whose failures come from the batch's data and may end in the
+# dead-letter topic; failures elsewhere (warehouse, producer, commits)
+# are treated as transient and only ever retried
+DATA_ERROR_STAGES = frozenset({"validate"})
+
+# Frame-only helper columns holding each row's ingestor type and the
+# batch fields its record lacked; underscored so they can't collide with
+# a record's own fields
+INGESTOR_TYPE_COLUMN = '_ingestor_type'
+ABSENT_FIELDS_COLUMN = '_absent_fields'
+
+def _restore_ints(values: pd.Series) -> pd.Series:
+    """Turn a float column back into nullable ints when nulls are all that upcast it."""
+    if pd.api.types.is_float_dtype(values.dtype) and (values.dropna() % 1 == 0).all():
+        return values.astype('Int64')
+    return values
+
+def _records_to_frame(records: List[Dict[str, Any]]) -> pd.DataFrame:
+    """Build a batch frame, remembering which of the frame's fields each record lacked."""
+    df = pd.DataFrame.from_records(records)
+    columns = frozenset(df.columns)
+    df[ABSENT_FIELDS_COLUMN] = [columns.difference(record) for record in records]
+    return df
+
+def _frame_to_records(df: pd.DataFrame) -> List[Dict[str, Any]]:
+    """
+    Convert a processed frame back to records, dropping helper columns.
+    
+    A batch frame holds the union of its records' fields, so every record
+    drops the null fields only other records had (fields added during
+    processing are kept); nulls come back as None, and int columns upcast
+    to float by those gaps come back as ints.
+    """
+    out = df.drop(columns=[INGESTOR_TYPE_COLUMN, ABSENT_FIELDS_COLUMN], errors='ignore')
+    out = out.apply(lambda values: _restore_ints(values) if values.hasnans else values)
+    records = out.astype(object).where(out.notna(), None).to_dict(orient="records")
+    
+    if ABSENT_FIELDS_COLUMN in df:
+        for record, absent in zip(records, df[ABSENT_FIELDS_COLUMN]):
+            for field in absent:
+                if field in record and record[field] is None:
+                    del record[field]
+    return records
+
+def _encode_keys(df: pd.DataFrame) -> List[bytes]:
+    """
+    Encode the processed-data message keys for a whole frame in one column op.
+    
+    Gives the same keys as `record_key` on the record path: nulls become
+    MISSING_KEY, and integer ids upcast to float by gaps in the column are
+    formatted as ints again.
+    """
+    if 'id' not in df:
+        return [MISSING_KEY] * len(df)
+    ids = _restore_ints(df['id'])
+    keys = ids.astype(str).str.encode('utf-8')
+    keys[ids.isna()] = MISSING_KEY
+    return keys.tolist()
+
+class StatIdx:
+    """Slots of the ETL counter array, in `get_stats()` order."""
+    PROCESSED = 0
+    TRANSFORMED = 1
+    VALIDATED = 2
+    ENRICHED = 3
+    ERRORS = 4
+
+_STAT_NAMES = (
+    "records_processed",
+    "records_transformed",
+    "records_validated",
+    "records_enriched",
+    "processing_errors",
+)
 
 class ETLProcessor:
     """Main ETL processor for data transformation and loading."""
     
-    def __init__(self, warehouse_manager, monitor):
-        """Initialize the ETL processor."""
+    def __init__(self, warehouse_manager, monitor,
+                 schemas: Optional[Dict[str, Dict[str, Any]]] = None):
+        """
+        Initialize the ETL processor.
+        
+        `schemas` maps an ingestor type to its record schema; records from
+        those sources are validated by a validator compiled for the schema.
+        """
         self.warehouse_manager = warehouse_manager
         self.monitor = monitor
+        self.schemas = schemas or {}
         self.logger = PipelineLogger(__name__)
         
-        # Kafka components
+        # Kafka components (librdkafka clients; values are (de)serialized here)
         self.kafka_consumer = None
         self.kafka_producer = None
+        self._serialize_value = None
+        
+        # librdkafka consumers must not be called concurrently, so every
+        # blocking consumer call runs on one dedicated thread, in order
+        self._consumer_executor: Optional[ThreadPoolExecutor] = None
         
         # Processing components
         self.transformer = None
         self.validator = None
         self.enricher = None
+        self._validators: Dict[str, RecordValidator] = {}
+        self._frame_validators: Dict[str, FrameValidator] = {}
         
         # Processing state
         self.is_running = False
         self.current_job = None
+        self._tasks = []
+        self._validate_queue = None
+        self._transform_queue = None
+        self._load_queue = None
         
-        # Statistics
-        self.stats = {
-            "records_processed": 0,
-            "records_transformed": 0,
-            "records_validated": 0,
-            "records_enriched": 0,
-            "processing_errors": 0,
-            "processing_time": 0.0,
-            "last_processed_batch": None
-        }
+        # Offset tracking: batches polled but not yet committed, by poll
+        # sequence number; a failed batch bumps the generation so every
+        # batch polled before the rewind is discarded
+        self._uncommitted: Dict[int, Dict[str, Any]] = {}
+        self._next_seq = 0
+        self._generation = 0
+        self._rewind_requested = False
+        
+        # Failures since the last commit: all of them drive the rewind
+        # backoff, only data failures count towards dead-lettering
+        self._consecutive_failures = 0
+        self._data_failures = 0
+        
+        # Set when the poll loop dies, so the orchestrator stops too
+        self.failure: Optional[BaseException] = None
+        self._failed: Optional[asyncio.Event] = None
+        self._loop = None
+        
+        config = get_config()
+        self.kafka_config = config.get_kafka_config()
+        
+        # Stream batching: flush a batch at batch_size records or after
+        # batch_timeout seconds, whichever comes first
+        processing_config = config.get_processing_config()
+        self.batch_size = processing_config.etl_batch_size
+        self.batch_timeout = processing_config.etl_batch_timeout_ms / 1000
+        self.max_batch_retries = processing_config.etl_max_batch_retries
+        self.retry_backoff = processing_config.etl_retry_backoff_ms / 1000
+        self.retry_backoff_max = processing_config.etl_retry_backoff_max_ms / 1000
+        
+        # Statistics: counters live in one array, bumped once per batch
+        self._stats_arr = np.zeros(len(_STAT_NAMES), dtype=np.int64)
+        self._processing_time = 0.0
+        self._last_processed_batch = None
     
     async def initialize(self):
         """Initialize the ETL processor."""
@@ -62,23 +192,48 @@ class ETLProcessor:
             self.transformer = DataTransformer()
             self.validator = DataValidator()
             self.enricher = DataEnricher()
+            self._validators = {
+                ingestor_type: compile_validator(schema, ingestor_type)
+                for ingestor_type, schema in self.schemas.items()
+            }
+            self._frame_validators = {
+                ingestor_type: compile_frame_validator(schema)
+                for ingestor_type, schema in self.schemas.items()
+            }
             
-            # Initialize Kafka consumer for raw data
-            self.kafka_consumer = KafkaConsumer(
-                'raw-data',
-                bootstrap_servers='localhost:9092',
-                group_id='etl-processor-group',
-                auto_offset_reset='earliest',
-                enable_auto_commit=True,
-                value_deserializer=lambda m: json.loads(m.decode('utf-8'))
+            # Initialize Kafka consumer for raw data; fetches wait for up to
+            # 1 MiB or 50 ms so each consume() call returns a full batch
+            self.kafka_consumer = Consumer({
+                'bootstrap.servers': self.kafka_config.bootstrap_servers,
+                'group.id': self.kafka_config.group_id,
+                'auto.offset.reset': self.kafka_config.auto_offset_reset,
+                # Offsets are committed per batch once it is loaded, whatever
+                # kafka_config.enable_auto_commit says
+                'enable.auto.commit': False,
+                'fetch.min.bytes': 1 << 20,
+                'fetch.wait.max.ms': 50
+            })
+            # Revoked partitions must leave the offset bookkeeping (see _on_revoke)
+            self._loop = asyncio.get_running_loop()
+            self.kafka_consumer.subscribe(
+                ['raw-data'], on_revoke=self._on_revoke, on_lost=self._on_revoke
             )
-            
-            # Initialize Kafka producer for processed data
-            self.kafka_producer = KafkaProducer(
-                bootstrap_servers='localhost:9092',
-                value_serializer=lambda v: json.dumps(v).encode('utf-8')
+            self._consumer_executor = ThreadPoolExecutor(
+                max_workers=1, thread_name_prefix="etl-consumer"
             )
             
+            # Initialize Kafka producer for processed data, batched the same
+            # way as the ingestion producer; sends are flushed per batch
+            self.kafka_producer = Producer({
+                'bootstrap.servers': self.kafka_config.bootstrap_servers,
+                'linger.ms': self.kafka_config.producer_linger_ms,
+                'batch.size': self.kafka_config.producer_batch_size,
+                'batch.num.messages': 10000,
+                'compression.type': self.kafka_config.producer_compression_type or 'none',
+                'queue.buffering.max.kbytes': self.kafka_config.producer_buffer_memory // 1024
+            })
+            self._serialize_value = get_value_serializer(self.kafka_config.processed_data_format)
+            
             self.logger.log_pipeline_status("initialized", "etl_processor")
             
         except Exception as e:
@@ -90,9 +245,20 @@ class ETLProcessor:
         try:
             self.logger.log_pipeline_status("starting", "etl_processor")
             self.is_running = True
+            self.failure = None
+            self._failed = asyncio.Event()
             
-            # Start processing loop
-            asyncio.create_task(self._process_data_stream())
+            # Start the poll loop and one worker per stage; bounded queues
+            # between them apply backpressure when a later stage falls behind
+            self._validate_queue = asyncio.Queue(maxsize=STAGE_QUEUE_SIZE)
+            self._transform_queue = asyncio.Queue(maxsize=STAGE_QUEUE_SIZE)
+            self._load_queue = asyncio.Queue(maxsize=STAGE_QUEUE_SIZE)
+            self._tasks = [
+                asyncio.create_task(self._process_data_stream()),
+                asyncio.create_task(self._run_stage("validate", self._validate_queue, self._validate_stage)),
+                asyncio.create_task(self._run_stage("transform", self._transform_queue, self._transform_stage)),
+                asyncio.create_task(self._run_stage("load", self._load_queue, self._load_stage)),
+            ]
             
             self.logger.log_pipeline_status("started", "etl_processor")
             
@@ -106,11 +272,22 @@ class ETLProcessor:
             self.logger.log_pipeline_status("shutting_down", "etl_processor")
             self.is_running = False
             
+            for task in self._tasks:
+                task.cancel()
+            await asyncio.gather(*self._tasks, return_exceptions=True)
+            self._tasks = []
+            
+            # Runs after any in-flight consume() on the consumer thread;
+            # cleared so a repeated shutdown doesn't close it twice
             if self.kafka_consumer:
-                self.kafka_consumer.close()
+                await self._run_on_consumer(self.kafka_consumer.close)
+                self._consumer_executor.shutdown(wait=False)
+                self.kafka_consumer = None
             
             if self.kafka_producer:
-                self.kafka_producer.close()
+                await asyncio.to_thread(
+                    self.kafka_producer.flush, self.kafka_config.producer_max_block_ms / 1000
+                )
             
             self.logger.log_pipeline_status("shutdown", "etl_processor")
             
@@ -118,77 +295,335 @@ class ETLProcessor:
             self.logger.log_error(e, {"component": "etl_processor"})
     
     async def _process_data_stream(self):
-        """Process incoming data stream from Kafka."""
+        """
+        Poll the raw-data stream in batches and feed them to the validate stage.
+        
+        This task is the only one that moves the consumer position: rewinds
+        requested by failed batches are applied here, between consume()
+        calls, so a seek never lands in the middle of a batch being polled.
+        """
         try:
-            for message in self.kafka_consumer:
-                if not self.is_running:
-                    break
+            while self.is_running:
+                if self._rewind_requested:
+                    # Back off before re-reading, so a failing warehouse or
+                    # producer pauses consumption instead of spinning on
+                    # the same batches
+                    await asyncio.sleep(self._retry_delay())
+                    await self._rewind_uncommitted()
                 
+                generation = self._generation
+                seq, batch = await self._poll_batch()
+                if batch and generation == self._generation and not self._rewind_requested:
+                    info = {
+                        "seq": seq,
+                        "generation": generation,
+                        "start_time": time.time(),
+                        "received": len(batch),
+                        "records": batch
+                    }
+                    # Blocks while the validate stage is backed up
+                    await self._validate_queue.put((info, batch))
+                elif not batch:
+                    # Nothing but skipped messages: let their offsets commit
+                    await self._complete_batch(seq, generation)
+                
+        except Exception as e:
+            self.logger.log_error(e, {"component": "data_stream_processing"})
+            self._fail_stream(e)
+            raise
+    
+    def _fail_stream(self, error: BaseException):
+        """Stop the stage workers after the poll loop died and report it via `wait_failed`."""
+        self.is_running = False
+        self.failure = error
+        current = asyncio.current_task()
+        for task in self._tasks:
+            if task is not current:
+                task.cancel()
+        if self._failed is not None:
+            self._failed.set()
+    
+    async def wait_failed(self) -> Optional[BaseException]:
+        """Wait until the processor stops on an unrecoverable error, and return it."""
+        await self._failed.wait()
+        return self.failure
+    
+    def _on_revoke(self, consumer, partitions):
+        """
+        Rebalance callback for revoked or lost partitions. Runs on the
+        consumer thread inside consume(), so the bookkeeping is handed to
+        the event loop, where it runs before that consume() returns.
+        """
+        revoked = [(tp.topic, tp.partition) for tp in partitions]
+        self._loop.call_soon_threadsafe(self._forget_partitions, revoked)
+    
+    def _forget_partitions(self, partitions: List[Tuple[str, int]]):
+        """Drop partitions from every uncommitted batch; their new owner re-reads them."""
+        for entry in self._uncommitted.values():
+            for partition in partitions:
+                entry["offsets"].pop(partition, None)
+    
+    def _retry_delay(self) -> float:
+        """Exponential backoff before the next rewind, by failures since the last commit."""
+        exponent = max(self._consecutive_failures - 1, 0)
+        return min(self.retry_backoff * 2 ** exponent, self.retry_backoff_max)
+    
+    async def _poll_batch(self) -> Tuple[int, List[Dict[str, Any]]]:
+        """
+        Accumulate records across partitions until the batch size or timeout is reached.
+        
+        The batch is registered as uncommitted before the first consume(),
+        with the first and last offset it read per (topic, partition), so a
+        rewind always covers it. Polling stops early once a rewind is
+        requested. Returns the batch's sequence number and its records.
+        """
+        seq = self._next_seq
+        self._next_seq += 1
+        offsets = {}
+        self._uncommitted[seq] = {"offsets": offsets, "done": False}
+        
+        batch = []
+        deadline = time.monotonic() + self.batch_timeout
+        
+        while self.is_running and not self._rewind_requested and len(batch) < self.batch_size:
+            remaining_ms = int((deadline - time.monotonic()) * 1000)
+            if remaining_ms <= 0:
+                break
+            
+            # consume() blocks, so run it off the event loop
+            messages = await self._run_on_consumer(
+                self.kafka_consumer.consume,
+                num_messages=self.batch_size - len(batch),
+                timeout=remaining_ms / 1000
+            )
+            for message in messages:
+                error = message.error()
+                if error is not None:
+                    if error.code() != KafkaError._PARTITION_EOF:
+                        self.logger.log_error(ValueError(str(error)), {
+                            "component": "kafka_consume",
+                            "topic": message.topic()
+                        })
+                    continue
+                # Bad messages are skipped, but their offsets still advance
+                partition = (message.topic(), message.partition())
+                first, _ = offsets.get(partition, (message.offset(), None))
+                offsets[partition] = (first, message.offset())
+                if message.value() is None:
+                    continue  # tombstone
+                try:
+                    batch.extend(expand_message(deserialize_value(message.value())))
+                except Exception as e:
+                    self._stats_arr[StatIdx.ERRORS] += 1
+                    self.logger.log_error(e, {
+                        "component": "kafka_decode",
+                        "topic": message.topic(),
+                        "partition": message.partition(),
+                        "offset": message.offset()
+                    })
+        
+        return seq, batch
+    
+    async def _complete_batch(self, seq: int, generation: int):
+        """
+        Mark a batch as durably handled and commit the contiguous prefix of
+        completed batches.
+        
+        Batches finish out of order relative to a failure, so a batch's
+        offsets are only committed once every batch polled before it is
+        done too; otherwise a later batch could commit past a failed one.
+        """
+        if generation != self._generation or seq not in self._uncommitted:
+            return  # discarded by a rewind; it will be re-read
+        self._uncommitted[seq]["done"] = True
+        
+        positions = {}
+        while self._uncommitted:
+            head = next(iter(self._uncommitted))
+            if not self._uncommitted[head]["done"]:
+                break
+            for partition, (_, last) in self._uncommitted.pop(head)["offsets"].items():
+                positions[partition] = max(positions.get(partition, 0), last + 1)
+        
+        if positions:
+            await self._run_on_consumer(
+                self.kafka_consumer.commit,
+                offsets=[TopicPartition(topic, partition, offset)
+                         for (topic, partition), offset in positions.items()],
+                asynchronous=False
+            )
+            self._consecutive_failures = 0
+            self._data_failures = 0
+    
+    async def _fail_batch(self, info: Dict[str, Any], stage: str):
+        """
+        Handle a batch that failed in `stage`.
+        
+        Every batch in flight is discarded and the consumer is rewound, after
+        a backoff, to the earliest uncommitted offset. Only a batch whose
+        data keeps failing (see DATA_ERROR_STAGES) is sent to the dead-letter
+        topic and treated as done, after `max_batch_retries` failures without
+        a commit in between; any other failure is retried until it clears.
+        """
+        if info["generation"] != self._generation:
+            return  # already being re-read
+        
+        self._consecutive_failures += 1
+        if stage in DATA_ERROR_STAGES:
+            self._data_failures += 1
+            if self._data_failures > self.max_batch_retries:
                 try:
-                    await self._process_record(message.value)
-                    self.stats["records_processed"] += 1
-                    
+                    await self._dead_letter(info["records"])
+                    self._stats_arr[StatIdx.ERRORS] += info["received"]
+                    self._data_failures = 0
+                    await self._complete_batch(info["seq"], info["generation"])
+                    return
                 except Exception as e:
-                    self.stats["processing_errors"] += 1
                     self.logger.log_error(e, {
-                        "component": "record_processing",
-                        "message": message.value
+                        "component": "kafka_dead_letter",
+                        "topic": self.kafka_config.topic_dead_letter
                     })
+        
+        # Stale-generation batches are dropped by the stages; the poll task
+        # performs the seek (see _process_data_stream)
+        self._generation += 1
+        self._rewind_requested = True
+    
+    async def _dead_letter(self, records: List[Dict[str, Any]]):
+        """Send the raw records of a batch that keeps failing to the dead-letter topic, as JSON like raw-data."""
+        topic = self.kafka_config.topic_dead_letter
+        for record in records:
+            value = serialize_value(record)
+            key = serialize_key((record.get('_metadata') or {}).get('source_file'))
+            try:
+                self.kafka_producer.produce(topic, value=value, key=key)
+            except BufferError:
+                await asyncio.to_thread(self.kafka_producer.poll, 1.0)
+                self.kafka_producer.produce(topic, value=value, key=key)
+        await asyncio.to_thread(self.kafka_producer.flush)
+        self.logger.logger.warning(f"Dead-lettered {len(records)} records to {topic}")
+    
+    async def _rewind_uncommitted(self):
+        """Seek every partition back to its earliest uncommitted offset."""
+        positions = {}
+        for entry in self._uncommitted.values():
+            for partition, (first, _) in entry["offsets"].items():
+                positions[partition] = min(positions.get(partition, first), first)
+        self._uncommitted.clear()
+        self._rewind_requested = False
+        
+        for (topic, partition), offset in positions.items():
+            try:
+                await self._run_on_consumer(
+                    self.kafka_consumer.seek, TopicPartition(topic, partition, offset)
+                )
+            except KafkaException as e:
+                # No longer assigned here; the new owner resumes from the
+                # last commit
+                self.logger.log_error(e, {
+                    "component": "kafka_rewind",
+                    "topic": topic,
+                    "partition": partition
+                })
+    
+    async def _run_on_consumer(self, fn, *args, **kwargs):
+        """Run a blocking consumer call on the consumer thread without blocking the loop."""
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(
+            self._consumer_executor, functools.partial(fn, *args, **kwargs)
+        )
+    
+    async def _run_stage(self, name: str, queue: asyncio.Queue, handler):
+        """
+        Run one pipeline stage: take (info, payload) items off `queue` and pass
+        them to `handler`, so stages overlap across batches. `info` holds the
+        batch's seq, generation, start_time, received count and raw records.
+        
+        Batches from a generation discarded by a rewind are dropped unseen.
+        """
+        while True:
+            info, payload = await queue.get()
+            try:
+                if info["generation"] != self._generation:
                     continue
+                await handler(info, payload)
                 
-        except Exception as e:
-            self.logger.log_error(e, {"component": "data_stream_processing"})
-            raise
+            except Exception as e:
+                self.logger.log_error(e, {
+                    "component": f"{name}_stage",
+                    "batch_size": info["received"]
+                })
+                try:
+                    await self._fail_batch(info, name)
+                except Exception as fail_error:
+                    self.logger.log_error(fail_error, {"component": "batch_failure"})
+            finally:
+                queue.task_done()
     
-    async def _process_record(self, record: Dict[str, Any]):
-        """Process a single record through the ETL pipeline."""
-        try:
-            start_time = time.time()
-            
-            # Extract metadata
-            metadata = record.get('_metadata', {})
-            source_type = metadata.get('ingestor_type', 'unknown')
-            
-            # Step 1: Validate data
-            validated_record = await self.validator.validate_record(record)
-            self.stats["records_validated"] += 1
-            
-            # Step 2: Transform data
-            transformed_record = await self.transformer.transform_record(validated_record)
-            self.stats["records_transformed"] += 1
-            
-            # Step 3: Enrich data
-            enriched_record = await self.enricher.enrich_record(transformed_record)
-            self.stats["records_enriched"] += 1
-            
-            # Step 4: Send to processed data topic
-            await self._send_to_processed_topic(enriched_record)
-            
-            # Step 5: Load to data warehouse
-            await self.warehouse_manager.load_record(enriched_record)
-            
-            processing_time = time.time() - start_time
-            self.stats["processing_time"] += processing_time
-            
-            # Record metrics
-            self.monitor.record_metric("etl_processing_time", processing_time)
-            self.monitor.record_metric("etl_records_processed", 1)
+    async def _validate_stage(self, info: Dict[str, Any], records: List[Dict[str, Any]]):
+        """Validate a consumed batch and hand it to the transform stage."""
+        validated = await self._validate_batch(records)
+        self._stats_arr[StatIdx.VALIDATED] += len(validated)
+        await self._transform_queue.put((info, validated))
+    
+    async def _transform_stage(self, info: Dict[str, Any], validated):
+        """Transform and enrich a validated batch and hand it to the load stage."""
+        if isinstance(validated, pd.DataFrame) and len(validated):
+            # Encode message keys once per batch while still columnar
+            df = self._transform_frame(validated)
+            keys = _encode_keys(df)
+            processed_records = _frame_to_records(df)
+        else:
+            keys = None
+            processed_records = await self._transform_batch(validated)
+        
+        self._stats_arr[[StatIdx.TRANSFORMED, StatIdx.ENRICHED]] += len(processed_records)
+        await self._load_queue.put((info, (processed_records, keys)))
+    
+    async def _load_stage(self, info: Dict[str, Any], payload):
+        """Produce and load a processed batch once, commit its offsets, then record its stats."""
+        processed_records, keys = payload
+        if processed_records:
+            if keys is None:
+                keys = [None] * len(processed_records)
+            for record, key in zip(processed_records, keys):
+                await self._send_to_processed_topic(record, key)
+            await asyncio.to_thread(self.kafka_producer.flush)
             
-        except Exception as e:
-            self.logger.log_error(e, {
-                "component": "record_processing",
-                "record": record
-            })
-            raise
+            # One bulk warehouse write per batch instead of one per record
+            load_start = time.time()
+            await self.warehouse_manager.load_records(processed_records)
+            self.logger.log_warehouse_load(
+                "processed_records", len(processed_records), time.time() - load_start
+            )
+        
+        # Only now is the batch durable downstream; failures above skip this
+        await self._complete_batch(info["seq"], info["generation"])
+        
+        processing_time = time.time() - info["start_time"]
+        processed = len(processed_records)
+        self._stats_arr[StatIdx.PROCESSED] += processed
+        self._stats_arr[StatIdx.ERRORS] += info["received"] - processed
+        self._processing_time += processing_time
+        self._last_processed_batch = datetime.now().isoformat()
+        
+        # Record metrics
+        self.monitor.record_metric("etl_processing_time", processing_time)
+        self.monitor.record_metric("etl_records_processed", processed)
     
-    async def _send_to_processed_topic(self, record: Dict[str, Any]):
-        """Send processed record to Kafka processed data topic."""
+    async def _send_to_processed_topic(self, record: Dict[str, Any], key: Optional[bytes] = None):
+        """Send processed record to Kafka processed data topic, with an optional pre-encoded key."""
         try:
-            self.kafka_producer.send(
-                topic='processed-data',
-                key=record.get('id', 'unknown').encode('utf-8'),
-                value=record
-            )
+            if key is None:
+                key = record_key(record.get('id'))
+            value = self._serialize_value(record)
+            try:
+                self.kafka_producer.produce('processed-data', value=value, key=key)
+            except BufferError:
+                # Local queue is full: serve delivery reports to drain it, then retry once
+                await asyncio.to_thread(self.kafka_producer.poll, 1.0)
+                self.kafka_producer.produce('processed-data', value=value, key=key)
+            self.kafka_producer.poll(0)
             
         except Exception as e:
             self.logger.log_error(e, {
@@ -211,27 +646,8 @@ class ETLProcessor:
             self.logger.log_processing_start("batch", len(records))
             start_time = time.time()
             
-            processed_records = []
-            
-            for record in records:
-                try:
-                    # Validate
-                    validated_record = await self.validator.validate_record(record)
-                    
-                    # Transform
-                    transformed_record = await self.transformer.transform_record(validated_record)
-                    
-                    # Enrich
-                    enriched_record = await self.enricher.enrich_record(transformed_record)
-                    
-                    processed_records.append(enriched_record)
-                    
-                except Exception as e:
-                    self.logger.log_error(e, {
-                        "component": "batch_processing",
-                        "record": record
-                    })
-                    continue
+            validated = await self._validate_batch(records)
+            processed_records = await self._transform_batch(validated)
             
             processing_time = time.time() - start_time
             self.logger.log_processing_complete("batch", len(processed_records), processing_time)
@@ -242,16 +658,104 @@ class ETLProcessor:
             self.logger.log_error(e, {"component": "batch_processing"})
             raise
     
+    def _supports_frames(self) -> bool:
+        """Check whether every processing component offers a vectorized frame method."""
+        return (
+            hasattr(self.validator, "validate_frame")
+            and hasattr(self.transformer, "transform_frame")
+            and hasattr(self.enricher, "enrich_frame")
+        )
+    
+    async def _validate_batch(self, records: List[Dict[str, Any]]):
+        """
+        Validate a batch, dropping invalid records.
+        
+        With vectorized components the batch becomes one DataFrame filtered
+        by the boolean row mask from `validate_frame`; otherwise records are
+        validated one by one and a list is returned.
+        """
+        if self._supports_frames():
+            df = _records_to_frame(records)
+            if '_metadata' in df:
+                # Few distinct values repeated on every row: store as int codes
+                df[INGESTOR_TYPE_COLUMN] = (
+                    df['_metadata'].str.get('ingestor_type').fillna('unknown').astype('category')
+                )
+            return df[self._frame_mask(df)] if len(df) else df
+        
+        validated_records = []
+        for record in records:
+            try:
+                source_type = record.get('_metadata', {}).get('ingestor_type', 'unknown')
+                validated_records.append(await self._validate_record(record, source_type))
+            except Exception as e:
+                self.logger.log_error(e, {
+                    "component": "batch_validation",
+                    "record": record
+                })
+        return validated_records
+    
+    def _frame_mask(self, df: pd.DataFrame) -> pd.Series:
+        """Row validity for a frame, using the compiled schema checks for the rows of each schema'd source."""
+        mask = pd.Series(self.validator.validate_frame(df), index=df.index)
+        if INGESTOR_TYPE_COLUMN in df:
+            for source_type, validate in self._frame_validators.items():
+                rows = df[INGESTOR_TYPE_COLUMN] == source_type
+                if rows.any():
+                    columns = frozenset(df.columns)
+                    mask = mask.where(~rows, validate(df, rows))
+                    # Columns added for defaults don't belong to other rows
+                    added = frozenset(df.columns) - columns
+                    if added and ABSENT_FIELDS_COLUMN in df:
+                        df.loc[~rows, ABSENT_FIELDS_COLUMN] = (
+                            df.loc[~rows, ABSENT_FIELDS_COLUMN].map(added.union)
+                        )
+        return mask
+    
+    async def _validate_record(self, record: Dict[str, Any], source_type: str) -> Dict[str, Any]:
+        """Validate one record, preferring the compiled validator for its source type."""
+        validate = self._validators.get(source_type)
+        if validate is not None:
+            return validate(record)
+        return await self.validator.validate_record(record)
+    
+    async def _transform_batch(self, validated) -> List[Dict[str, Any]]:
+        """Transform and enrich the output of `_validate_batch` into records."""
+        if isinstance(validated, pd.DataFrame):
+            if not len(validated):
+                return []
+            return _frame_to_records(self._transform_frame(validated))
+        
+        processed_records = []
+        for record in validated:
+            try:
+                transformed_record = await self.transformer.transform_record(record)
+                processed_records.append(await self.enricher.enrich_record(transformed_record))
+            except Exception as e:
+                self.logger.log_error(e, {
+                    "component": "batch_processing",
+                    "record": record
+                })
+        return processed_records
+    
+    def _transform_frame(self, df: pd.DataFrame) -> pd.DataFrame:
+        """Transform and enrich a validated DataFrame with the vectorized components."""
+        df = self.transformer.transform_frame(df)
+        return self.enricher.enrich_frame(df)
+    
     def get_status(self) -> Dict[str, Any]:
         """Get the current status of the ETL processor."""
         return {
             "is_running": self.is_running,
             "current_job": self.current_job,
-            "stats": self.stats,
+            "stats": self.get_stats(),
             "kafka_consumer_connected": self.kafka_consumer is not None,
             "kafka_producer_connected": self.kafka_producer is not None
         }
     
     def get_stats(self) -> Dict[str, Any]:
         """Get detailed processing statistics."""
-        return self.stats
+        stats = dict(zip(_STAT_NAMES, self._stats_arr.tolist()))
+        stats["processing_time"] = self._processing_time
+        stats["last_processed_batch"] = self._last_processed_batch
+        return stats
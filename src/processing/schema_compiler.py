@@ -0,0 +1,127 @@
+"""
+Schema Compiler
+
+Generates specialized per-schema record validators at startup. Records on
+the raw-data topic share a fixed schema per ingestor type, so instead of
+walking the schema for every field of every record, the checks for one
+schema are emitted as straight-line Python source and compiled once.
+
+Schemas use the same format as the CSV ingestor config:
+`{column: {"type": "numeric" | "string" | "datetime", "required": bool,
+"default": value}}`.
+"""
+
+from datetime import datetime
+from typing import TYPE_CHECKING, Any, Callable, Dict
+
+if TYPE_CHECKING:
+    import pandas as pd
+
+# Accepted Python types per schema type once a message is decoded;
+# datetimes arrive as ISO strings over JSON
+_TYPE_CHECKS = {
+    "numeric": (int, float),
+    "string": (str,),
+    "datetime": (str, datetime),
+}
+
+RecordValidator = Callable[[Dict[str, Any]], Dict[str, Any]]
+FrameValidator = Callable[["pd.DataFrame", "pd.Series"], "pd.Series"]
+
+def _field_source(index: int, column: str, config: Dict[str, Any]) -> str:
+    """Emit the validation lines for one schema column."""
+    name = f"v{index}"
+    lines = [f"    {name} = record.get({column!r})"]
+    # NaN counts as missing, as it does on the frame path
+    lines.append(f"    if {name} != {name}:")
+    lines.append(f"        {name} = None")
+    
+    if config.get("default") is not None:
+        lines.append(f"    if {name} is None:")
+        lines.append(f"        {name} = record[{column!r}] = defaults[{column!r}]")
+    elif config.get("required", True):
+        lines.append(f"    if {name} is None:")
+        message = f"Missing required field {column!r}"
+        lines.append(f"        raise ValueError({message!r})")
+    
+    field_type = config.get("type")
+    if field_type in _TYPE_CHECKS:
+        # bool is an int subclass but never a valid numeric value
+        bad_type = f"not isinstance({name}, types[{field_type!r}])"
+        if field_type == "numeric":
+            bad_type = f"({bad_type} or isinstance({name}, bool))"
+        lines.append(f"    if {name} is not None and {bad_type}:")
+        message = f"Field {column!r} is not {field_type}: "
+        lines.append(f"        raise ValueError({message!r} + repr({name}))")
+    
+    return "\n".join(lines)
+
+def compile_validator(schema: Dict[str, Dict[str, Any]], name: str = "validate") -> RecordValidator:
+    """
+    Compile a validator specialized for `schema`.
+    
+    The returned function checks required fields and types, fills defaults
+    in place and returns the record; it raises ValueError on invalid input.
+    """
+    body = [_field_source(index, column, config or {})
+            for index, (column, config) in enumerate(schema.items())]
+    source = "def _validate(record):\n" + "\n".join(body + ["    return record"]) + "\n"
+    
+    namespace = {
+        "types": _TYPE_CHECKS,
+        "defaults": {column: config["default"] for column, config in schema.items()
+                     if config and config.get("default") is not None},
+    }
+    exec(compile(source, f"<schema_validator:{name}>", "exec"), namespace)
+    return namespace["_validate"]
+
+def compile_frame_validator(schema: Dict[str, Dict[str, Any]]) -> FrameValidator:
+    """
+    Build the vectorized counterpart of `compile_validator` for DataFrames.
+    
+    The returned function takes a frame and a boolean row selector, fills
+    defaults for the selected rows in place and returns a boolean Series
+    that is False for selected rows failing the schema. Only the selected
+    rows are read or written; a column the frame lacks is only added when
+    a default must be filled, and stays None outside the selector. Types
+    are checked exactly, as decoded from JSON, so bools never pass as
+    numeric.
+    """
+    import pandas as pd
+    
+    checks = [(column, config or {}) for column, config in schema.items()]
+    
+    def validate_frame(df: "pd.DataFrame", rows: "pd.Series") -> "pd.Series":
+        valid = pd.Series(True, index=df.index)
+        selected = rows[rows].index
+        for column, config in checks:
+            default = config.get("default")
+            if column not in df:
+                if default is not None:
+                    df[column] = pd.Series(None, index=df.index, dtype=object)
+                elif config.get("required", True):
+                    valid[selected] = False
+                    continue
+                else:
+                    continue
+            
+            values = df.loc[selected, column]
+            missing = values.index[values.isna()]
+            if default is not None:
+                if len(missing):
+                    # Object dtype takes any default without an upcast
+                    if df[column].dtype != object:
+                        df[column] = df[column].astype(object)
+                    df.loc[missing, column] = pd.Series([default] * len(missing),
+                                                        index=missing, dtype=object)
+                    values = df.loc[selected, column]
+            elif config.get("required", True):
+                valid[missing] = False
+            
+            if config.get("type") in _TYPE_CHECKS:
+                present = values[values.notna()]
+                bad_type = ~present.map(type).isin(_TYPE_CHECKS[config["type"]])
+                valid[present.index[bad_type]] = False
+        return valid
+    
+    return validate_frame
@@ -5,77 +5,109 @@ Configures structured logging with structlog for the entire
 ETL pipeline system with proper formatting and output handling.
 """
 
+import atexit
 import logging
+import queue
 import sys
+from logging.handlers import QueueHandler, QueueListener
 from pathlib import Path
 from typing import Optional
 
+import orjson
 import structlog
 from structlog.stdlib import LoggerFactory
 
+def _orjson_dumps(event_dict, **kwargs) -> str:
+    """
+    Render an event dict with orjson; stdlib handlers expect str, not bytes.
+    
+    Non-str dict keys are stringified like the stdlib json renderer did, so
+    a log call (often inside an except block) never raises on them.
+    """
+    return orjson.dumps(event_dict, option=orjson.OPT_NON_STR_KEYS, **kwargs).decode("utf-8")
+
+# Processor chain for every log call: only what the success path needs
+HOT_PROCESSORS = [
+    structlog.stdlib.filter_by_level,
+    structlog.stdlib.add_log_level,
+    structlog.processors.TimeStamper(fmt="iso", utc=True),
+    structlog.processors.JSONRenderer(serializer=_orjson_dumps)
+]
+
+# Error path additionally renders stack info and exceptions before the renderer
+ERROR_PROCESSORS = HOT_PROCESSORS[:-1] + [
+    structlog.processors.StackInfoRenderer(),
+    structlog.processors.format_exc_info,
+    HOT_PROCESSORS[-1]
+]
+
+# Background listener that owns the real handlers; see setup_logging
+_LISTENER: Optional[QueueListener] = None
+
 def setup_logging(
     log_level: str = "INFO",
     log_file: Optional[str] = None,
     enable_console: bool = True,
     enable_file: bool = False
-) -> None:
+) -> QueueListener:
     """
     Setup structured logging for the ETL pipeline.
     
+    Callers only enqueue records on the root logger's QueueHandler; a
+    background QueueListener thread does the actual console/file writes.
+    
     Args:
         log_level: Logging level (DEBUG, INFO, WARNING, ERROR, CRITICAL)
         log_file: Path to log file (optional)
         enable_console: Enable console logging
         enable_file: Enable file logging
+        
+    Returns:
+        The started listener; stop it with stop_logging() to flush on exit
     """
+    global _LISTENER
     
     # Configure structlog
     structlog.configure(
-        processors=[
-            structlog.stdlib.filter_by_level,
-            structlog.stdlib.add_logger_name,
-            structlog.stdlib.add_log_level,
-            structlog.stdlib.PositionalArgumentsFormatter(),
-            structlog.processors.TimeStamper(fmt="iso"),
-            structlog.processors.StackInfoRenderer(),
-            structlog.processors.format_exc_info,
-            structlog.processors.UnicodeDecoder(),
-            structlog.processors.JSONRenderer()
-        ],
+        processors=HOT_PROCESSORS,
         context_class=dict,
         logger_factory=LoggerFactory(),
         wrapper_class=structlog.stdlib.BoundLogger,
         cache_logger_on_first_use=True,
     )
     
-    # Setup standard library logging
-    logging.basicConfig(
-        format="%(message)s",
-        stream=sys.stdout,
-        level=getattr(logging, log_level.upper())
-    )
+    # Setup standard library logging with exactly one handler per output;
+    # structlog has already rendered the message
+    level = getattr(logging, log_level.upper())
+    formatter = logging.Formatter("%(message)s")
+    handlers = []
+    
+    # Create console handler if enabled
+    if enable_console:
+        console_handler = logging.StreamHandler(sys.stdout)
+        console_handler.setFormatter(formatter)
+        handlers.append(console_handler)
     
-    # Create log directory if file logging is enabled
+    # Create log directory and file handler if file logging is enabled
     if enable_file and log_file:
         log_path = Path(log_file)
         log_path.parent.mkdir(parents=True, exist_ok=True)
         
-        # Add file handler
         file_handler = logging.FileHandler(log_file)
-        file_handler.setLevel(getattr(logging, log_level.upper()))
-        
-        # Get the root logger and add file handler
-        root_logger = logging.getLogger()
-        root_logger.addHandler(file_handler)
+        file_handler.setFormatter(formatter)
+        handlers.append(file_handler)
     
-    # Create console handler if enabled
-    if enable_console:
-        console_handler = logging.StreamHandler(sys.stdout)
-        console_handler.setLevel(getattr(logging, log_level.upper()))
-        
-        # Get the root logger and add console handler
-        root_logger = logging.getLogger()
-        root_logger.addHandler(console_handler)
+    # Replace any previous setup, draining its listener first
+    stop_logging()
+    root_logger = logging.getLogger()
+    for handler in list(root_logger.handlers):
+        root_logger.removeHandler(handler)
+    root_logger.setLevel(level)
+    
+    log_queue = queue.SimpleQueue()
+    root_logger.addHandler(QueueHandler(log_queue))
+    _LISTENER = QueueListener(log_queue, *handlers, respect_handler_level=True)
+    _LISTENER.start()
     
     # Set loggers for external libraries
     logging.getLogger("kafka").setLevel(logging.WARNING)
@@ -83,6 +115,17 @@ def setup_logging(
     logging.getLogger("botocore").setLevel(logging.WARNING)
     logging.getLogger("urllib3").setLevel(logging.WARNING)
     logging.getLogger("requests").setLevel(logging.WARNING)
+    
+    return _LISTENER
+
+def stop_logging() -> None:
+    """Stop the logging listener, writing out any queued records."""
+    global _LISTENER
+    if _LISTENER is not None:
+        _LISTENER.stop()
+        _LISTENER = None
+
+atexit.register(stop_logging)
 
 def get_logger(name: str) -> structlog.BoundLogger:
     """
@@ -101,83 +144,116 @@ class PipelineLogger:
     
     def __init__(self, name: str):
         """Initialize pipeline logger."""
-        self.logger = get_logger(name)
+        # Bind the static context once; the stdlib logger backs the cheap
+        # level checks that let disabled calls skip the processor chain
+        self._stdlib_logger = logging.getLogger(name)
+        self.logger = get_logger(name).bind(component=name)
+        self._error_logger = structlog.wrap_logger(
+            self._stdlib_logger,
+            processors=ERROR_PROCESSORS,
+            wrapper_class=structlog.stdlib.BoundLogger,
+            context_class=dict
+        ).bind(component=name)
         self.name = name
     
     def log_ingestion_start(self, source: str, record_count: int = None):
         """Log the start of data ingestion."""
+        if not self._stdlib_logger.isEnabledFor(logging.INFO):
+            return
+        
         self.logger.info(
             "Data ingestion started",
             source=source,
             record_count=record_count,
-            event="ingestion_start"
+            event_type="ingestion_start"
         )
     
     def log_ingestion_complete(self, source: str, record_count: int, duration: float):
         """Log the completion of data ingestion."""
+        if not self._stdlib_logger.isEnabledFor(logging.INFO):
+            return
+        
         self.logger.info(
             "Data ingestion completed",
             source=source,
             record_count=record_count,
             duration_seconds=duration,
-            event="ingestion_complete"
+            event_type="ingestion_complete"
         )
     
     def log_processing_start(self, job_id: str, data_size: int):
         """Log the start of data processing."""
+        if not self._stdlib_logger.isEnabledFor(logging.INFO):
+            return
+        
         self.logger.info(
             "Data processing started",
             job_id=job_id,
             data_size=data_size,
-            event="processing_start"
+            event_type="processing_start"
         )
     
     def log_processing_complete(self, job_id: str, processed_count: int, duration: float):
         """Log the completion of data processing."""
+        if not self._stdlib_logger.isEnabledFor(logging.INFO):
+            return
+        
         self.logger.info(
             "Data processing completed",
             job_id=job_id,
             processed_count=processed_count,
             duration_seconds=duration,
-            event="processing_complete"
+            event_type="processing_complete"
         )
     
     def log_warehouse_load(self, table: str, record_count: int, duration: float):
         """Log data warehouse loading."""
+        if not self._stdlib_logger.isEnabledFor(logging.INFO):
+            return
+        
         self.logger.info(
             "Data warehouse load completed",
             table=table,
             record_count=record_count,
             duration_seconds=duration,
-            event="warehouse_load"
+            event_type="warehouse_load"
         )
     
     def log_error(self, error: Exception, context: dict = None):
         """Log an error with context."""
-        self.logger.error(
+        if not self._stdlib_logger.isEnabledFor(logging.ERROR):
+            return
+        
+        self._error_logger.error(
             "Pipeline error occurred",
             error_type=type(error).__name__,
             error_message=str(error),
             context=context or {},
-            event="pipeline_error"
+            event_type="pipeline_error"
         )
     
     def log_metric(self, metric_name: str, value: float, tags: dict = None):
         """Log a custom metric."""
+        if not self._stdlib_logger.isEnabledFor(logging.INFO):
+            return
+        
         self.logger.info(
             "Custom metric",
             metric_name=metric_name,
             value=value,
             tags=tags or {},
-            event="metric"
+            event_type="metric"
         )
     
     def log_pipeline_status(self, status: str, component: str, details: dict = None):
         """Log pipeline component status."""
+        if not self._stdlib_logger.isEnabledFor(logging.INFO):
+            return
+        
         self.logger.info(
             "Pipeline component status",
             status=status,
             component=component,
             details=details or {},
-            event="pipeline_status"
+            event_type="pipeline_status"
         )
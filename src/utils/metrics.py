@@ -0,0 +1,78 @@
+"""
+Metric Helpers for ETL Pipeline
+
+Lightweight in-process counters shared between pipeline components
+so monitoring loops can read totals without walking component stats,
+and buffers that batch metric updates before they reach the monitor.
+"""
+
+import asyncio
+import threading
+from collections import defaultdict
+from typing import Dict
+
+class AtomicCounter:
+    """Thread-safe integer counter."""
+    
+    def __init__(self, initial: int = 0):
+        """Initialize the counter."""
+        self._value = initial
+        self._lock = threading.Lock()
+    
+    def add(self, amount: int = 1) -> int:
+        """Add to the counter and return the new value."""
+        with self._lock:
+            self._value += amount
+            return self._value
+    
+    @property
+    def value(self) -> int:
+        """Current counter value."""
+        return self._value
+
+class MetricBuffer:
+    """
+    Accumulates metric increments locally and ships them to the monitor
+    in one flush, instead of one `record_metric` call per update.
+    
+    Updates must come from the event loop thread; no locking is done.
+    """
+    
+    def __init__(self, monitor, flush_interval: float = 30.0):
+        """Initialize the metric buffer."""
+        self.monitor = monitor
+        self.flush_interval = flush_interval
+        self._values: Dict[str, float] = defaultdict(int)
+        self._task = None
+    
+    def add(self, name: str, value: float = 1):
+        """Add to a buffered metric."""
+        self._values[name] += value
+    
+    def flush(self):
+        """Send all buffered metrics to the monitor and clear the buffer."""
+        values, self._values = self._values, defaultdict(int)
+        for name, value in values.items():
+            self.monitor.record_metric(name, value)
+    
+    def start(self):
+        """Start the background flush loop."""
+        if self._task is None:
+            self._task = asyncio.create_task(self._flush_loop())
+    
+    async def stop(self):
+        """Stop the background flush loop and flush what is left."""
+        if self._task is not None:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+        self.flush()
+    
+    async def _flush_loop(self):
+        """Flush buffered metrics every `flush_interval` seconds."""
+        while True:
+            await asyncio.sleep(self.flush_interval)
+            self.flush()
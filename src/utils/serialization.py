@@ -0,0 +1,106 @@
+"""
+Kafka Serialization
+
+Shared (de)serializers for Kafka message keys and values. JSON (orjson)
+is used on topics external producers may write to; MessagePack is used
+on internal topics such as processed-data, where both ends are ours.
+Decoded raw-data messages in the CSV ingestor's columnar send format are
+expanded back into records here too.
+"""
+
+from typing import Any, Callable, Dict, List, Optional
+
+import msgpack
+import orjson
+
+_ORJSON_OPTIONS = orjson.OPT_NAIVE_UTC | orjson.OPT_SERIALIZE_NUMPY
+
+def _default(value):
+    """
+    Convert values neither codec handles natively: numpy scalars/arrays
+    (e.g. object-dtype string columns), pandas Timestamp/NaT and datetimes.
+    """
+    if hasattr(value, "ndim") and hasattr(value, "tolist"):
+        return value.tolist()
+    if value != value:  # NaT and other NaN-like scalars
+        return None
+    if hasattr(value, "isoformat"):
+        return value.isoformat()
+    raise TypeError(f"Type is not serializable: {type(value).__name__}")
+
+def serialize_value(value: Any) -> bytes:
+    """Serialize a Kafka message value to JSON bytes."""
+    return orjson.dumps(value, default=_default, option=_ORJSON_OPTIONS)
+
+def deserialize_value(data: bytes) -> Any:
+    """Deserialize JSON bytes from a Kafka message value."""
+    return orjson.loads(data)
+
+def pack_value(value: Any) -> bytes:
+    """Serialize a Kafka message value to MessagePack bytes."""
+    return msgpack.packb(value, default=_default, use_bin_type=True)
+
+def unpack_value(data: bytes) -> Any:
+    """Deserialize MessagePack bytes from a Kafka message value."""
+    return msgpack.unpackb(data, raw=False)
+
+def get_value_serializer(wire_format: str) -> Callable[[Any], bytes]:
+    """Get the value serializer for a topic wire format ("json" or "msgpack")."""
+    if wire_format == "msgpack":
+        return pack_value
+    if wire_format == "json":
+        return serialize_value
+    raise ValueError(f"Unsupported wire format: {wire_format}")
+
+def get_value_deserializer(wire_format: str) -> Callable[[bytes], Any]:
+    """Get the value deserializer for a topic wire format ("json" or "msgpack")."""
+    if wire_format == "msgpack":
+        return unpack_value
+    if wire_format == "json":
+        return deserialize_value
+    raise ValueError(f"Unsupported wire format: {wire_format}")
+
+def serialize_key(key) -> Optional[bytes]:
+    """Serialize a Kafka message key, passing pre-encoded bytes through."""
+    if key is None or isinstance(key, bytes):
+        return key
+    # Non-string ids (ints, floats) are keyed by their str() form, matching
+    # the frame path's astype(str)
+    return str(key).encode('utf-8')
+
+# Key for records without an id (None or NaN)
+MISSING_KEY = b'unknown'
+
+def record_key(record_id) -> bytes:
+    """
+    Serialize a record's id into its Kafka message key.
+    
+    Ids missing or None/NaN map to MISSING_KEY; frame-based producers must
+    encode keys the same way so partitioning doesn't depend on the path.
+    """
+    if record_id is None or (isinstance(record_id, float) and record_id != record_id):
+        return MISSING_KEY
+    return serialize_key(record_id)
+
+def expand_message(value: Dict[str, Any]) -> List[Dict[str, Any]]:
+    """
+    Expand a decoded raw-data message into records.
+    
+    Columnar messages (`{"_columns": {...}, "_metadata": {...}}`) are rebuilt
+    into one record per row; row messages are returned as-is. Raises
+    ValueError for values that are not JSON objects.
+    """
+    if not isinstance(value, dict):
+        raise ValueError(f"Expected a JSON object, got {type(value).__name__}")
+    columns = value.get('_columns')
+    if columns is None:
+        return [value]
+    
+    metadata = value.get('_metadata', {})
+    names = list(columns)
+    records = []
+    for row in zip(*columns.values()):
+        record = dict(zip(names, row))
+        record['_metadata'] = metadata
+        records.append(record)
+    return records
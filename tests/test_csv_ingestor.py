@@ -0,0 +1,87 @@
+"""Tests for incremental CSV directory ingestion."""
+
+import asyncio
+import json
+from pathlib import Path
+
+import pytest
+
+pytest.importorskip("structlog")
+pytest.importorskip("orjson")
+
+from src.ingestion.csv_ingestor import CSVIngestor
+
+def _write_csv(path: Path, rows: int = 1) -> Path:
+    path.write_text("id,value\n" + "".join(f"{i},{i * 10}\n" for i in range(rows)))
+    return path
+
+@pytest.fixture
+def ingestor(tmp_path):
+    """An ingestor whose per-file processing only records which files it saw."""
+    ingestor = CSVIngestor(kafka_producer=None, monitor=None)
+    ingestor._watermark_path = tmp_path / "watermark" / ".ingest_watermark.json"
+    ingestor.processed = []
+    
+    async def process_single_file(file_path, *args, **kwargs):
+        if Path(file_path).name.startswith("bad"):
+            raise ValueError("parse error")
+        ingestor.processed.append(Path(file_path).name)
+    
+    ingestor._process_single_file = process_single_file
+    return ingestor
+
+def _ingest(ingestor, directory: Path, incremental: bool):
+    asyncio.run(ingestor._process_directory(str(directory), {}, 100, False, incremental))
+
+def _mark_ingested(ingestor, path: Path):
+    stat = path.stat()
+    ingestor._watermark[str(path)] = (stat.st_mtime, stat.st_size)
+
+def test_incremental_skips_files_unchanged_since_last_ingest(ingestor, tmp_path):
+    seen = _write_csv(tmp_path / "a.csv")
+    _write_csv(tmp_path / "b.csv")
+    _mark_ingested(ingestor, seen)
+    
+    _ingest(ingestor, tmp_path, incremental=True)
+    
+    assert ingestor.processed == ["b.csv"]
+
+def test_incremental_reingests_changed_files(ingestor, tmp_path):
+    changed = _write_csv(tmp_path / "a.csv")
+    _mark_ingested(ingestor, changed)
+    _write_csv(changed, rows=5)
+    
+    _ingest(ingestor, tmp_path, incremental=True)
+    
+    assert ingestor.processed == ["a.csv"]
+
+def test_non_incremental_ingests_every_file(ingestor, tmp_path):
+    for name in ("a.csv", "b.csv"):
+        _mark_ingested(ingestor, _write_csv(tmp_path / name))
+    
+    _ingest(ingestor, tmp_path, incremental=False)
+    
+    assert sorted(ingestor.processed) == ["a.csv", "b.csv"]
+
+def test_watermark_records_ingested_files_and_persists(ingestor, tmp_path):
+    path = _write_csv(tmp_path / "a.csv")
+    
+    _ingest(ingestor, tmp_path, incremental=True)
+    
+    stat = path.stat()
+    assert ingestor._watermark[str(path)] == (stat.st_mtime, stat.st_size)
+    assert ingestor._load_watermark() == ingestor._watermark
+    assert json.loads(ingestor._watermark_path.read_text()) == {str(path): [stat.st_mtime, stat.st_size]}
+
+def test_failed_files_are_not_watermarked(ingestor, tmp_path):
+    bad = _write_csv(tmp_path / "bad.csv")
+    _write_csv(tmp_path / "good.csv")
+    
+    _ingest(ingestor, tmp_path, incremental=True)
+    _ingest(ingestor, tmp_path, incremental=True)
+    
+    assert str(bad) not in ingestor._watermark
+    assert ingestor.processed == ["good.csv"]
+
+def test_missing_watermark_file_loads_empty(ingestor):
+    assert ingestor._load_watermark() == {}
@@ -0,0 +1,53 @@
+"""Tests for the dashboard's chart downsampling."""
+
+import pytest
+
+np = pytest.importorskip("numpy")
+pd = pytest.importorskip("pandas")
+dashboard = pytest.importorskip("src.monitoring.dashboard")
+
+lttb_indices = dashboard.lttb_indices
+
+def test_short_series_is_returned_whole():
+    assert lttb_indices(np.arange(10), np.arange(10), threshold=20).tolist() == list(range(10))
+
+def test_threshold_below_three_disables_downsampling():
+    assert len(lttb_indices(np.arange(50), np.arange(50), threshold=2)) == 50
+
+@pytest.mark.parametrize("n, threshold", [(100, 10), (1001, 1000), (5000, 3), (12345, 997)])
+def test_at_most_threshold_points_with_endpoints_kept(n, threshold):
+    x = np.arange(n)
+    y = np.sin(x / 7.0)
+    
+    indices = lttb_indices(x, y, threshold=threshold)
+    
+    assert len(indices) <= threshold
+    assert indices[0] == 0
+    assert indices[-1] == n - 1
+    assert np.all(np.diff(indices) > 0)
+
+def test_spike_is_preserved():
+    x = np.arange(1000)
+    y = np.zeros(1000)
+    y[437] = 100.0
+    
+    assert 437 in lttb_indices(x, y, threshold=50)
+
+def test_datetime_x_values():
+    x = pd.date_range("2024-01-01", periods=2000, freq="min")
+    y = np.random.default_rng(0).normal(size=2000)
+    
+    indices = lttb_indices(x, y, threshold=100)
+    
+    assert len(indices) == 100
+    assert indices[0] == 0 and indices[-1] == 1999
+    assert np.all(np.diff(indices) > 0)
+
+def test_datetime_and_numeric_x_agree():
+    x = pd.date_range("2024-01-01", periods=500, freq="s")
+    y = np.cos(np.arange(500) / 11.0)
+    
+    by_datetime = lttb_indices(x, y, threshold=60)
+    by_number = lttb_indices(x.asi8, y, threshold=60)
+    
+    assert by_datetime.tolist() == by_number.tolist()
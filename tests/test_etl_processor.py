@@ -0,0 +1,350 @@
+"""Tests for the ETL processor's batch plumbing, run without Kafka or the processing components."""
+
+import asyncio
+import sys
+import time
+import types
+from concurrent.futures import ThreadPoolExecutor
+
+import pytest
+
+pd = pytest.importorskip("pandas")
+pytest.importorskip("numpy")
+pytest.importorskip("confluent_kafka")
+pytest.importorskip("structlog")
+pytest.importorskip("dotenv")
+
+# The transformer, validator and enricher are only referenced at
+# initialize(); stand-ins are enough to import the module
+for _module, _name in (("data_transformer", "DataTransformer"),
+                       ("data_validator", "DataValidator"),
+                       ("data_enricher", "DataEnricher")):
+    sys.modules.setdefault(f"src.processing.{_module}",
+                           types.SimpleNamespace(**{_name: object}))
+
+from src.processing import etl_processor
+from src.utils.serialization import MISSING_KEY, record_key, serialize_value
+
+def test_frame_and_record_keys_agree():
+    records = [{"id": 1}, {"id": None}, {"id": 3}, {"name": "no id"}]
+    df = pd.DataFrame.from_records(records)
+    
+    # The gap upcasts the id column to float
+    assert df["id"].dtype.kind == "f"
+    assert etl_processor._encode_keys(df) == [record_key(r.get("id")) for r in records]
+    assert etl_processor._encode_keys(df) == [b"1", MISSING_KEY, b"3", MISSING_KEY]
+
+def test_frame_and_record_keys_agree_for_string_and_float_ids():
+    for ids in (["a", None, "c"], [1.5, 2.25, None]):
+        df = pd.DataFrame({"id": ids})
+        
+        assert etl_processor._encode_keys(df) == [record_key(value) for value in ids]
+
+def test_frame_without_id_column_uses_missing_key():
+    assert etl_processor._encode_keys(pd.DataFrame({"x": [1, 2]})) == [MISSING_KEY] * 2
+
+MIXED_BATCH = [
+    {"id": 1, "amount": 10, "note": None, "_metadata": {"ingestor_type": "csv"}},
+    {"id": 2, "_metadata": {"ingestor_type": "csv"}},
+    {"url": "https://example.com", "title": "t", "_metadata": {"ingestor_type": "web_scraper"}},
+    {"id": 4, "score": 0.25, "seen_at": pd.Timestamp("2024-01-20 10:30"),
+     "_metadata": {"ingestor_type": "api"}},
+]
+
+def test_records_round_trip_through_a_frame():
+    df = etl_processor._records_to_frame(MIXED_BATCH)
+    
+    assert etl_processor._frame_to_records(df) == MIXED_BATCH
+
+def test_round_trip_restores_ints_upcast_by_gaps():
+    records = [{"n": 1}, {"other": "x"}, {"n": 3}]
+    df = etl_processor._records_to_frame(records)
+    
+    assert df["n"].dtype.kind == "f"
+    out = etl_processor._frame_to_records(df)
+    assert out == records
+    assert all(type(record["n"]) is int for record in out if "n" in record)
+
+def test_fields_added_by_processing_are_kept():
+    df = etl_processor._records_to_frame([{"id": 1}, {"id": 2}])
+    df["derived"] = [None, "x"]
+    
+    assert etl_processor._frame_to_records(df) == [{"id": 1, "derived": None}, {"id": 2, "derived": "x"}]
+
+class _FrameValidator:
+    def validate_frame(self, df):
+        return df["id"].notna() if "id" in df else pd.Series(True, index=df.index)
+
+class _FrameTransformer:
+    def transform_frame(self, df):
+        return df
+
+class _FrameEnricher:
+    def enrich_frame(self, df):
+        return df
+
+@pytest.fixture
+def processor():
+    processor = etl_processor.ETLProcessor(warehouse_manager=None, monitor=None)
+    processor.validator = _FrameValidator()
+    processor.transformer = _FrameTransformer()
+    processor.enricher = _FrameEnricher()
+    return processor
+
+def test_frame_path_matches_input_records(processor):
+    async def run():
+        validated = await processor._validate_batch(MIXED_BATCH)
+        return await processor._transform_batch(validated)
+    
+    # The web_scraper record has no id and is filtered out by the validator
+    assert asyncio.run(run()) == [MIXED_BATCH[0], MIXED_BATCH[1], MIXED_BATCH[3]]
+
+def test_schema_defaults_only_reach_their_source(processor):
+    from src.processing.schema_compiler import compile_frame_validator
+    
+    processor._frame_validators = {
+        "csv": compile_frame_validator({"segment": {"type": "string", "default": "Standard"}})
+    }
+    
+    async def run():
+        return await processor._transform_batch(await processor._validate_batch(MIXED_BATCH))
+    
+    records = asyncio.run(run())
+    
+    assert [record.get("segment") for record in records] == ["Standard", "Standard", None]
+    assert "segment" not in records[2]
+
+# Stream tests: fake librdkafka clients, so the poll loop, stage workers,
+# commits and rewinds run for real, without a broker
+
+class _Message:
+    def __init__(self, topic, partition, offset, value):
+        self._topic, self._partition, self._offset, self._value = topic, partition, offset, value
+    
+    def error(self):
+        return None
+    
+    def topic(self):
+        return self._topic
+    
+    def partition(self):
+        return self._partition
+    
+    def offset(self):
+        return self._offset
+    
+    def value(self):
+        return self._value
+
+class _FakeConsumer:
+    """Serves fixed per-partition message logs from a seekable position, recording commits."""
+    
+    def __init__(self, logs):
+        self.logs = {
+            ("raw-data", partition): [
+                _Message("raw-data", partition, offset, serialize_value(record))
+                for offset, record in enumerate(records)
+            ]
+            for partition, records in logs.items()
+        }
+        self.positions = {partition: 0 for partition in self.logs}
+        self.commits = []
+        self.callbacks = {}
+        self.fail_consume = None
+    
+    def subscribe(self, topics, **callbacks):
+        self.callbacks = callbacks
+    
+    def consume(self, num_messages, timeout):
+        if self.fail_consume is not None:
+            raise self.fail_consume
+        messages = []
+        for partition, log in self.logs.items():
+            position = self.positions[partition]
+            taken = log[position:position + num_messages - len(messages)]
+            self.positions[partition] = position + len(taken)
+            messages.extend(taken)
+        if not messages:
+            time.sleep(min(timeout, 0.01))
+        return messages
+    
+    def seek(self, tp):
+        self.positions[(tp.topic, tp.partition)] = tp.offset
+    
+    def commit(self, offsets, asynchronous):
+        self.commits.append({(tp.topic, tp.partition): tp.offset for tp in offsets})
+    
+    def close(self):
+        pass
+    
+    def committed_to_end(self):
+        committed = {}
+        for commit in self.commits:
+            committed.update(commit)
+        return committed == {partition: len(log) for partition, log in self.logs.items()}
+
+class _FakeProducer:
+    def __init__(self):
+        self.sent = []
+    
+    def produce(self, topic, value, key):
+        self.sent.append((topic, value, key))
+    
+    def poll(self, timeout):
+        return 0
+    
+    def flush(self, timeout=None):
+        return 0
+
+class _FlakyWarehouse:
+    """Fails the first `failures` loads, then keeps every loaded record."""
+    
+    def __init__(self, failures=0):
+        self.failures = failures
+        self.loaded = []
+    
+    async def load_records(self, records):
+        if self.failures:
+            self.failures -= 1
+            raise ConnectionError("warehouse unavailable")
+        self.loaded.extend(records)
+
+class _Monitor:
+    def record_metric(self, name, value):
+        pass
+
+class _PoisonValidator(_FrameValidator):
+    """Rejects whole batches containing a poison record, like a broken schema would."""
+    
+    def validate_frame(self, df):
+        if "poison" in df:
+            raise ValueError("unparseable batch")
+        return super().validate_frame(df)
+
+def _stream_processor(monkeypatch, logs, warehouse, validator=_FrameValidator):
+    consumer, producer = _FakeConsumer(logs), _FakeProducer()
+    monkeypatch.setattr(etl_processor, "Consumer", lambda config: consumer)
+    monkeypatch.setattr(etl_processor, "Producer", lambda config: producer)
+    monkeypatch.setattr(etl_processor, "DataValidator", validator, raising=False)
+    monkeypatch.setattr(etl_processor, "DataTransformer", _FrameTransformer, raising=False)
+    monkeypatch.setattr(etl_processor, "DataEnricher", _FrameEnricher, raising=False)
+    
+    processor = etl_processor.ETLProcessor(warehouse_manager=warehouse, monitor=_Monitor())
+    processor.batch_size = 2
+    processor.batch_timeout = 0.02
+    processor.retry_backoff = processor.retry_backoff_max = 0.001
+    processor.max_batch_retries = 2
+    return processor, consumer, producer
+
+def _run_stream(processor, until, timeout=5.0):
+    async def run():
+        await processor.initialize()
+        await processor.start()
+        try:
+            deadline = time.monotonic() + timeout
+            while not until() and time.monotonic() < deadline:
+                await asyncio.sleep(0.01)
+        finally:
+            await processor.shutdown()
+    
+    asyncio.run(run())
+
+def _records(partition, count):
+    return [{"id": partition * 100 + n, "_metadata": {"ingestor_type": "csv"}} for n in range(count)]
+
+def test_batches_commit_in_poll_order(processor):
+    consumer = _FakeConsumer({})
+    processor.kafka_consumer = consumer
+    processor._consumer_executor = ThreadPoolExecutor(max_workers=1)
+    for seq, offsets in enumerate(({("raw-data", 0): (0, 1)},
+                                   {("raw-data", 0): (2, 3), ("raw-data", 1): (0, 4)},
+                                   {("raw-data", 1): (5, 5)})):
+        processor._uncommitted[seq] = {"offsets": offsets, "done": False}
+    
+    async def run():
+        await processor._complete_batch(1, 0)
+        assert consumer.commits == []  # batch 0 is still in flight
+        await processor._complete_batch(0, 0)
+        await processor._complete_batch(2, 0)
+    
+    asyncio.run(run())
+    processor._consumer_executor.shutdown()
+    
+    assert consumer.commits == [{("raw-data", 0): 4, ("raw-data", 1): 5}, {("raw-data", 1): 6}]
+    assert processor._uncommitted == {}
+
+def test_transient_load_failures_rewind_without_dead_lettering(monkeypatch):
+    logs = {0: _records(0, 5), 1: _records(1, 3)}
+    warehouse = _FlakyWarehouse(failures=5)
+    processor, consumer, producer = _stream_processor(monkeypatch, logs, warehouse)
+    
+    _run_stream(processor, consumer.committed_to_end)
+    
+    # More failures than max_batch_retries, yet nothing is dead-lettered:
+    # every record is re-read and loaded (at least once) after the warehouse recovers
+    assert consumer.committed_to_end()
+    assert not any(topic == processor.kafka_config.topic_dead_letter for topic, _, _ in producer.sent)
+    loaded_ids = {record["id"] for record in warehouse.loaded}
+    assert loaded_ids == {r["id"] for records in logs.values() for r in records}
+
+def test_failed_batch_is_redelivered(monkeypatch):
+    logs = {0: _records(0, 2)}
+    warehouse = _FlakyWarehouse(failures=1)
+    processor, consumer, _ = _stream_processor(monkeypatch, logs, warehouse)
+    
+    _run_stream(processor, consumer.committed_to_end)
+    
+    assert consumer.commits == [{("raw-data", 0): 2}]
+    assert [record["id"] for record in warehouse.loaded] == [0, 1]
+
+def test_data_failures_are_dead_lettered_after_retries(monkeypatch):
+    poison = [{"id": 1, "poison": True, "_metadata": {"ingestor_type": "csv"}}]
+    warehouse = _FlakyWarehouse()
+    processor, consumer, producer = _stream_processor(
+        monkeypatch, {0: poison}, warehouse, validator=_PoisonValidator
+    )
+    
+    _run_stream(processor, consumer.committed_to_end)
+    
+    assert consumer.committed_to_end()
+    assert warehouse.loaded == []
+    assert [topic for topic, _, _ in producer.sent] == [processor.kafka_config.topic_dead_letter]
+
+def test_revoked_partitions_leave_uncommitted_offsets(processor):
+    from confluent_kafka import TopicPartition
+    
+    async def run():
+        processor._loop = asyncio.get_running_loop()
+        processor._uncommitted = {
+            0: {"offsets": {("raw-data", 0): (0, 3), ("raw-data", 1): (0, 1)}, "done": False},
+            1: {"offsets": {("raw-data", 1): (2, 2)}, "done": False},
+        }
+        # librdkafka runs the callback on the consumer thread
+        await asyncio.to_thread(processor._on_revoke, None, [TopicPartition("raw-data", 1)])
+        await asyncio.sleep(0)
+    
+    asyncio.run(run())
+    
+    assert processor._uncommitted == {
+        0: {"offsets": {("raw-data", 0): (0, 3)}, "done": False},
+        1: {"offsets": {}, "done": False},
+    }
+
+def test_poll_failure_stops_the_stage_workers(monkeypatch):
+    processor, consumer, _ = _stream_processor(monkeypatch, {}, _FlakyWarehouse())
+    consumer.fail_consume = RuntimeError("consumer fenced")
+    
+    async def run():
+        await processor.initialize()
+        await processor.start()
+        failure = await asyncio.wait_for(processor.wait_failed(), 5)
+        await asyncio.sleep(0)
+        workers_done = all(task.done() for task in processor._tasks)
+        await processor.shutdown()
+        return failure, workers_done
+    
+    failure, workers_done = asyncio.run(run())
+    
+    assert failure is consumer.fail_consume
+    assert workers_done
+    assert not processor.is_running
@@ -0,0 +1,138 @@
+"""Tests for the compiled per-schema record validators."""
+
+import warnings
+from datetime import datetime
+
+import pytest
+
+from src.processing.schema_compiler import compile_frame_validator, compile_validator
+
+SCHEMA = {
+    "id": {"type": "string", "required": True},
+    "amount": {"type": "numeric", "required": True},
+    "segment": {"type": "string", "default": "Standard"},
+    "created_at": {"type": "datetime", "required": False},
+}
+
+def test_valid_record_is_returned():
+    validate = compile_validator(SCHEMA)
+    record = {"id": "c1", "amount": 10.5, "segment": "Premium", "created_at": "2024-01-20"}
+    
+    assert validate(record) is record
+
+def test_missing_required_field_raises():
+    validate = compile_validator(SCHEMA)
+    
+    with pytest.raises(ValueError, match="Missing required field 'amount'"):
+        validate({"id": "c1"})
+
+def test_optional_field_may_be_missing():
+    validate = compile_validator(SCHEMA)
+    
+    assert "created_at" not in validate({"id": "c1", "amount": 1})
+
+def test_default_is_filled_in_place():
+    validate = compile_validator(SCHEMA)
+    record = {"id": "c1", "amount": 1, "segment": None}
+    
+    validate(record)
+    
+    assert record["segment"] == "Standard"
+
+def test_numeric_accepts_int_and_float():
+    validate = compile_validator(SCHEMA)
+    
+    validate({"id": "c1", "amount": 3})
+    validate({"id": "c1", "amount": 3.0})
+
+def test_bool_is_not_numeric():
+    validate = compile_validator(SCHEMA)
+    
+    with pytest.raises(ValueError, match="Field 'amount' is not numeric: True"):
+        validate({"id": "c1", "amount": True})
+
+def test_wrong_type_raises():
+    validate = compile_validator(SCHEMA)
+    
+    with pytest.raises(ValueError, match="Field 'id' is not string"):
+        validate({"id": 7, "amount": 1})
+
+@pytest.mark.parametrize("value", ["2024-01-20T10:00:00", datetime(2024, 1, 20)])
+def test_datetime_accepts_iso_strings_and_datetimes(value):
+    validate = compile_validator(SCHEMA)
+    
+    assert validate({"id": "c1", "amount": 1, "created_at": value})["created_at"] == value
+
+def test_datetime_rejects_numbers():
+    validate = compile_validator(SCHEMA)
+    
+    with pytest.raises(ValueError, match="Field 'created_at' is not datetime"):
+        validate({"id": "c1", "amount": 1, "created_at": 1705744800})
+
+def test_frame_validator_matches_record_validator():
+    pd = pytest.importorskip("pandas")
+    records = [
+        {"id": "c1", "amount": 1, "source": "csv"},
+        {"id": "c2", "amount": True, "source": "csv"},
+        {"id": "c3", "source": "csv"},
+        {"id": 4, "amount": "x", "source": "api"},
+    ]
+    df = pd.DataFrame.from_records(records)
+    rows = df["source"] == "csv"
+    
+    valid = compile_frame_validator(SCHEMA)(df, rows)
+    
+    # Rows outside the selector are left to other checks
+    assert valid.tolist() == [True, False, False, True]
+    assert df.loc[rows, "segment"].tolist() == ["Standard"] * 3
+
+def test_nan_counts_as_missing():
+    validate = compile_validator(SCHEMA)
+    
+    with pytest.raises(ValueError, match="Missing required field 'amount'"):
+        validate({"id": "c1", "amount": float("nan")})
+    assert validate({"id": "c1", "amount": 1, "segment": float("nan")})["segment"] == "Standard"
+
+def test_frame_validator_leaves_other_rows_alone():
+    pd = pytest.importorskip("pandas")
+    df = pd.DataFrame.from_records([
+        {"id": "c1", "amount": 1, "source": "csv"},
+        {"url": "https://example.com", "score": 0.5, "source": "web"},
+    ])
+    rows = df["source"] == "csv"
+    
+    valid = compile_frame_validator(SCHEMA)(df, rows)
+    
+    assert valid.tolist() == [True, True]
+    # Only the defaulted column is added, and only filled for csv rows
+    assert "created_at" not in df
+    assert df["segment"].tolist()[0] == "Standard"
+    assert pd.isna(df["segment"].tolist()[1])
+
+def test_frame_validator_fills_defaults_of_another_type_without_upcast():
+    pd = pytest.importorskip("pandas")
+    df = pd.DataFrame({"id": ["c1", "c2"], "amount": [1, 2], "segment": [float("nan"), float("nan")]})
+    rows = pd.Series([True, False])
+    
+    with warnings.catch_warnings():
+        warnings.simplefilter("error")
+        compile_frame_validator(SCHEMA)(df, rows)
+    
+    assert df["segment"].tolist()[0] == "Standard"
+    assert pd.isna(df["segment"].tolist()[1])
+
+def test_frame_and_record_validators_agree_on_nan():
+    pd = pytest.importorskip("pandas")
+    records = [{"id": "c1", "amount": float("nan")}, {"id": "c2", "amount": 2}]
+    df = pd.DataFrame.from_records(records)
+    
+    frame_valid = compile_frame_validator(SCHEMA)(df, pd.Series(True, index=df.index)).tolist()
+    record_valid = []
+    for record in records:
+        try:
+            compile_validator(SCHEMA)(dict(record))
+            record_valid.append(True)
+        except ValueError:
+            record_valid.append(False)
+    
+    assert frame_valid == record_valid == [False, True]
@@ -0,0 +1,60 @@
+"""Tests for Kafka message (de)serialization helpers."""
+
+import pytest
+
+pytest.importorskip("msgpack")
+pytest.importorskip("orjson")
+
+from src.utils.serialization import deserialize_value, expand_message, serialize_value
+
+def test_row_message_is_returned_as_is():
+    message = {"id": 1, "_metadata": {"ingestor_type": "api"}}
+    
+    assert expand_message(message) == [message]
+
+def test_columnar_message_is_expanded_into_rows():
+    metadata = {"source_file": "a.csv", "ingestor_type": "csv"}
+    message = {"_columns": {"id": [1, 2, 3], "name": ["a", "b", "c"]}, "_metadata": metadata}
+    
+    records = expand_message(message)
+    
+    assert records == [
+        {"id": 1, "name": "a", "_metadata": metadata},
+        {"id": 2, "name": "b", "_metadata": metadata},
+        {"id": 3, "name": "c", "_metadata": metadata},
+    ]
+
+def test_columnar_message_round_trips_through_json():
+    message = {"_columns": {"id": [1, 2], "score": [0.5, None]}, "_metadata": {"ingestor_type": "csv"}}
+    
+    records = expand_message(deserialize_value(serialize_value(message)))
+    
+    assert [record["score"] for record in records] == [0.5, None]
+    assert all(record["_metadata"] == {"ingestor_type": "csv"} for record in records)
+
+def test_columnar_message_without_metadata():
+    assert expand_message({"_columns": {"id": [1]}}) == [{"id": 1, "_metadata": {}}]
+
+def test_empty_columnar_message_has_no_records():
+    assert expand_message({"_columns": {"id": []}}) == []
+
+@pytest.mark.parametrize("value", [[1, 2], "text", 3, None])
+def test_non_object_values_raise(value):
+    with pytest.raises(ValueError, match="Expected a JSON object"):
+        expand_message(value)
+
+def test_columnar_datetimes_serialize_like_rows_with_nat_as_null():
+    pd = pytest.importorskip("pandas")
+    pytest.importorskip("structlog")
+    from src.ingestion.csv_ingestor import _iter_records, _to_columns
+    
+    batch = pd.DataFrame({
+        "id": [1, 2],
+        "created_at": pd.to_datetime(["2024-01-20 10:30:00", "not a date"], errors="coerce"),
+    })
+    
+    columns = deserialize_value(serialize_value({"_columns": _to_columns(batch)}))
+    rows = [deserialize_value(serialize_value(record)) for record in _iter_records(batch)]
+    
+    assert columns["_columns"]["created_at"] == ["2024-01-20T10:30:00", None]
+    assert expand_message(columns) == [dict(row, _metadata={}) for row in rows]